@@ -0,0 +1,529 @@
+import gzip
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from difflib import SequenceMatcher
+import re
+
+from build_calendar import SOURCE_RANK, SOURCE_COLORS, CATEGORY_WEIGHTS, add_event_smart, reset_events, stored_events, get_categories, \
+    iter_source_records, normalize_event, fc_event, build_dictionaries, encode_compact, build_events, set_reference_now, \
+    parse_event_date, generate_html
+
+# Usage: python benchmark_build.py [dedup|categories] [event_count ...]
+# dedup:      runs synthetic events through the legacy linear dedup and the
+#             indexed one, checks both produce the same merged output and
+#             that at least MIN_MERGE_SHARE of the input merged.
+# categories: compares get_categories throughput with the legacy substring scan.
+# payload:    size and parse time of the verbose event payload vs the compact
+#             columnar shards, on the committed *_data.json files.
+# memory:     peak memory of json.load ingestion vs the streaming reader, both
+#             feeding add_event_smart, for a synthetic feed written as a JSON
+#             array and as JSON Lines; then the traced peak and RSS of a real
+#             build_calendar.py run on that feed, default vs --stream.
+#
+# python benchmark_build.py scale [event_count ...] [--save-baseline]
+# scale:      times parse_event_date, get_categories, add_event_smart and
+#             generate_html on seeded feeds in the five scrapers' formats
+#             (1k, 10k, 100k and 1M events by default), each size in its own
+#             process so peak RSS is per size. Compared with
+#             fixtures/build_baseline.json; exits 1 on a regression.
+#             Unique counts are always checked; throughput and RSS only when
+#             the baseline was recorded on the same kind of machine.
+
+DATA_FILES = ["lvhs_data.json", "chamber_data.json", "cwc_data.json", "windriver_data.json", "county10_data.json"]
+MIN_MERGE_SHARE = 0.3     # dedup input must merge at least this share of events
+
+
+def load_vocabulary():
+    # Title words from the committed feeds keep the synthetic titles realistic
+    words = set()
+    for filename in DATA_FILES:
+        if os.path.exists(filename):
+            with open(filename, "r", encoding='utf-8') as f:
+                for e in json.load(f):
+                    words.update(w for w in e['title'].split() if w.isalpha())
+    return sorted(words) or ["Community", "Event"]
+
+
+def make_events(count, seed=42, days=365):
+    # Clusters of 1-3 sources listing the same event on the same day under
+    # title variants, like make_feeds, so a large share of the input merges
+    rng = random.Random(seed)
+    words = load_vocabulary()
+    sources = list(SOURCE_RANK.keys())
+    events = []
+    base_titles = [" ".join(rng.choice(words) for _ in range(rng.randint(2, 5))).title() for _ in range(max(count // 3, 1))]
+    while len(events) < count:
+        title = rng.choice(base_titles)
+        start = (date(2026, 1, 1) + timedelta(days=rng.randrange(days))).strftime("%Y-%m-%d")
+        for source in rng.sample(sources, rng.choice([1, 1, 2, 2, 3])):
+            variant = rng.choice(TITLE_VARIANTS).format(title)
+            style = SOURCE_COLORS[source]
+            url = rng.choice(["#", f"https://example.org/{slug(source)}/{len(events)}", f"https://example.org/{slug(source)}/{slug(variant)}"])
+            events.append({
+                "title": variant,
+                "start": start,
+                "allDay": True,
+                "url": url,
+                "color": style['bg'],
+                "textColor": style['text'],
+                "extendedProps": {"source": source, "categories": ["Community & Social"]}
+            })
+    # Sources are read one after another, not cluster by cluster
+    events = events[:count]
+    rng.shuffle(events)
+    return events
+
+
+# --- Reference: the original linear-scan dedup ---
+def legacy_is_same_event(evt1, evt2):
+    if evt1['url'] and evt2['url'] and evt1['url'] != '#' and evt1['url'] == evt2['url']:
+        return True
+    if evt1['start'] != evt2['start']: return False
+    def clean(t):
+        t = t.lower()
+        t = re.sub(r'\b(the|annual|monthly|weekly|meeting|of)\b', '', t)
+        return re.sub(r'[^a-z0-9]', '', t)
+    t1, t2 = clean(evt1['title']), clean(evt2['title'])
+    if t1 == t2: return True
+    if len(t1) < 5 or len(t2) < 5: return False
+    return SequenceMatcher(None, t1, t2).ratio() > 0.75
+
+
+def legacy_dedup(events):
+    stored = dict()
+    for new_event in events:
+        date_key = new_event['start']
+        if date_key not in stored: stored[date_key] = []
+        merged = False
+        for existing_event in stored[date_key]:
+            if legacy_is_same_event(new_event, existing_event):
+                new_rank = SOURCE_RANK.get(new_event['extendedProps']['source'], 99)
+                old_rank = SOURCE_RANK.get(existing_event['extendedProps']['source'], 99)
+                if new_rank < old_rank:
+                    existing_event['title'] = new_event['title']
+                    existing_event['url'] = new_event['url']
+                    existing_event['color'] = new_event['color']
+                    existing_event['textColor'] = new_event['textColor']
+                    existing_event['extendedProps']['source'] = new_event['extendedProps']['source']
+                    existing_event['extendedProps']['categories'] = new_event['extendedProps']['categories']
+                merged = True
+                break
+        if not merged: stored[date_key].append(new_event)
+    return [e for dl in stored.values() for e in dl]
+
+
+def indexed_dedup(events):
+    reset_events()
+    for e in events:
+        add_event_smart(e)
+    return [e for dl in stored_events.values() for e in dl]
+
+
+def copy_events(events):
+    return [dict(e, extendedProps=dict(e["extendedProps"])) for e in events]
+
+
+def bench_dedup(count):
+    events = make_events(count)
+    t0 = time.perf_counter()
+    new_out = indexed_dedup(copy_events(events))
+    t_new = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    old_out = legacy_dedup(copy_events(events))
+    t_old = time.perf_counter() - t0
+
+    merged = count - len(new_out)
+    match = "✅ identical" if old_out == new_out else "❌ MISMATCH"
+    print(f"📊 dedup {count:>7} events: legacy {t_old:8.2f}s | indexed {t_new:8.2f}s | "
+          f"{t_old / max(t_new, 1e-9):6.1f}x | {len(new_out)} unique, {merged} merged | {match}")
+    # Too few merges and the comparison says nothing about the merge path
+    assert merged >= count * MIN_MERGE_SHARE, f"only {merged} of {count} events merged"
+    return old_out == new_out
+
+
+# --- Reference: the original per-keyword substring scoring ---
+def legacy_get_categories(title, source):
+    title_lower = title.lower()
+    scoring_results = []
+    for cat, data in CATEGORY_WEIGHTS.items():
+        boost_val = data.get("source_boost", {}).get(source, 0)
+        kw_matches = [k for k in data.get("keywords", []) if k in title_lower]
+        scoring_results.append((cat, boost_val + len(kw_matches) * 4))
+    active_winners = [x for x in scoring_results if x[1] > 0]
+    current_categories = []
+    if active_winners:
+        active_winners.sort(key=lambda x: x[1], reverse=True)
+        current_categories.append(active_winners[0][0])
+    else:
+        current_categories.append("Community & Social")
+    festival_keywords = ["festival", "fest", "fair", "parade", "celebration", "market"]
+    if any(k in title_lower for k in festival_keywords):
+        if "Community & Social" not in current_categories:
+            current_categories.append("Community & Social")
+        if "market" in title_lower and "Food & Drink" not in current_categories:
+            current_categories.append("Food & Drink")
+    return current_categories
+
+
+def bench_categories(count):
+    events = make_events(count)
+    pairs = [(e["title"], e["extendedProps"]["source"]) for e in events]
+
+    t0 = time.perf_counter()
+    new_out = [get_categories(t, s) for t, s in pairs]
+    t_new = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    old_out = [legacy_get_categories(t, s) for t, s in pairs]
+    t_old = time.perf_counter() - t0
+
+    # Differences are expected: the compiled matcher respects word boundaries
+    changed = sum(1 for a, b in zip(old_out, new_out) if a != b)
+    print(f"📊 categories {count:>7} titles: legacy {count / t_old:10.0f}/s | compiled {count / t_new:10.0f}/s | "
+          f"{t_old / max(t_new, 1e-9):5.1f}x | {changed} re-tagged")
+    return True
+
+
+def write_feed(events, path, lines=False):
+    # Scraper-style records ({source, title, date, link}) like the *_data.json files
+    with open(path, "w", encoding='utf-8') as f:
+        records = ({"source": e["extendedProps"]["source"], "title": e["title"], "date": e["start"], "link": e["url"]} for e in events)
+        if lines:
+            for r in records:
+                f.write(json.dumps(r) + "\n")
+        else:
+            json.dump(list(records), f, indent=2)
+
+
+def measure_peak(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / (1024 * 1024), elapsed
+
+
+def build_peak(tmp, flags):
+    # Real build_calendar.py run in tmp -> (traced peak MB, peak RSS MB)
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "build_calendar.py")
+    proc = subprocess.Popen([sys.executable, script, "--no-series", "--trace-memory"] + flags,
+                            cwd=tmp, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    assert status == 0, f"build_calendar.py {' '.join(flags)} failed"
+    with open(os.path.join(tmp, "build_metrics.json"), "r", encoding='utf-8') as f:
+        traced = json.load(f)["memory"]["peak_bytes"]
+    return traced / (1024 * 1024), usage.ru_maxrss / 1024
+
+
+def bench_memory(count):
+    events = make_events(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        array_path = os.path.join(tmp, "county10_data.json")
+        lines_path = os.path.join(tmp, "feed.jsonl")
+        write_feed(events, array_path)
+        write_feed(events, lines_path, lines=True)
+        del events
+
+        # Both readers feed the same dedup, so only the decoding differs
+        def legacy_ingest():
+            reset_events()
+            with open(array_path, "r", encoding='utf-8') as f:
+                data = json.load(f)
+            for e in data:
+                add_event_smart(normalize_event(e, "County 10"))
+
+        def stream_ingest(path):
+            def run():
+                reset_events()
+                for e in iter_source_records(path):
+                    add_event_smart(normalize_event(e, "County 10"))
+            return run
+
+        size_mb = os.path.getsize(array_path) / (1024 * 1024)
+        for label, fn in [("json.load", legacy_ingest), ("stream array", stream_ingest(array_path)),
+                          ("stream jsonl", stream_ingest(lines_path))]:
+            peak, elapsed = measure_peak(fn)
+            print(f"📊 memory {count:>7} events ({size_mb:6.1f} MB feed): {label:<12} peak {peak:8.1f} MB | {elapsed:6.2f}s")
+        reset_events()
+
+        # Whole builds on the same feed: the default path against --stream
+        for label, flags in [("build", ["--full"]), ("build stream", ["--stream"])]:
+            traced, rss = build_peak(tmp, flags)
+            print(f"📊 memory {count:>7} events ({size_mb:6.1f} MB feed): {label:<12} peak {traced:8.1f} MB | RSS {rss:7.1f} MB")
+    return True
+
+
+def decode_compact(columns, index):
+    # Mirror of decodeShard() in the page
+    base = date.fromisoformat(index["base"]).toordinal()
+    events = []
+    for i in range(len(columns["title"])):
+        src = index["sources"][columns["source"][i]]
+        events.append({
+            "title": columns["title"][i],
+            "start": date.fromordinal(base + columns["day"][i]).isoformat(),
+            "url": columns["url"][i],
+            "color": src[1],
+            "textColor": src[2],
+            "extendedProps": {"source": src[0], "categories": [c for b, c in enumerate(index["categories"]) if columns["cats"][i] & (1 << b)]}
+        })
+    return events
+
+
+def time_best(fn, repeat=20):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_payload(count=None):
+    # Uses the committed feeds; the event count argument is ignored
+    set_reference_now()
+    events, _ = build_events(None)
+    colors = {src: style['bg'] for src, style in SOURCE_COLORS.items()}
+    verbose = json.dumps([fc_event(e, colors) for e in events])
+
+    source_table, categories = build_dictionaries(events, colors)
+    index = {"base": min(e["start"] for e in events)[:7] + "-01", "sources": source_table, "categories": categories}
+    source_ids = {row[0]: i for i, row in enumerate(source_table)}
+    category_bits = {cat: 1 << i for i, cat in enumerate(categories)}
+    compact = json.dumps(encode_compact(events, source_ids, category_bits, datetime.strptime(index["base"], "%Y-%m-%d")),
+                         ensure_ascii=False, separators=(',', ':'))
+    index_json = json.dumps(index)
+
+    assert [e["start"] for e in decode_compact(json.loads(compact), index)] == [e["start"] for e in events]
+    t_verbose = time_best(lambda: json.loads(verbose))
+    t_compact = time_best(lambda: (json.loads(compact), json.loads(index_json)))
+    t_decode = time_best(lambda: decode_compact(json.loads(compact), index))
+    for label, payload, parse, decode in [("verbose", verbose, t_verbose, 0), ("compact", compact + index_json, t_compact, t_decode - t_compact)]:
+        raw = payload.encode("utf-8")
+        print(f"📊 payload {label:<8} {len(events)} events: {len(raw) / 1024:7.1f} KB raw | "
+              f"{len(gzip.compress(raw)) / 1024:6.1f} KB gzip | parse {parse * 1000:5.2f} ms | decode {max(decode, 0) * 1000:5.2f} ms")
+    return True
+
+
+# --- Scale suite ---
+SCALE_COUNTS = [1000, 10000, 100000, 1000000]
+SCALE_BASELINE_FILE = os.path.join("fixtures", "build_baseline.json")
+THROUGHPUT_THRESHOLD = 0.25   # fail when events/sec drops by more than this
+RSS_THRESHOLD = 0.20          # fail when peak RSS grows by more than this
+
+SCALE_PER_DAY = 10            # listings per calendar day; bigger feeds span more days
+SCALE_NOW = datetime(2026, 1, 15)  # fixed "today", so the feeds and their dedup never drift
+LVHS_LINK = "https://www.landerschools.org/o/lvhs/events"
+TITLE_VARIANTS = ["{}", "The {}", "{} (Annual)", "Annual {}", "{} Meeting", "{} 2026"]
+
+
+def slug(title):
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+
+
+def feed_record(source, title, day, rng):
+    # One raw record the way that source's scraper writes it
+    if source == "LVHS":
+        date_str = f"{day.isoformat()}T{rng.choice(['15:45', '18:00', '19:00'])}:00.000-0{rng.choice([6, 7])}:00"
+        return {"source": source, "title": title + " in " + rng.choice(["Auditorium", "Gym"]), "date": date_str, "link": LVHS_LINK}
+    if source == "Lander Chamber":
+        return {"source": source, "title": title, "date": day.strftime("%A %b %-d, %Y"),
+                "link": f"https://info.landerchamber.org/events/details/{slug(title)}-{rng.randrange(10000, 99999)}"}
+    if source == "CWC":
+        return {"source": source, "title": title, "date": day.isoformat(), "link": f"https://www.cwc.edu/event/{slug(title)}/"}
+    if source == "WRVC":
+        link = f"https://windriver.org/event/{slug(title)}/"
+        style = rng.random()
+        if style < 0.4:
+            # REST feed
+            date_str = f"{day.isoformat()}T{rng.choice(['08:00', '10:30', '18:00'])}:00"
+        elif style < 0.7 or day.year != SCALE_NOW.year:
+            # Browser feed, recurring event: the date is in the link
+            date_str = f"{day.strftime('%B %-d')}{', ' + str(day.year) if day.year != SCALE_NOW.year else ''} @ 10:30 am"
+            link += day.isoformat() + "/"
+        else:
+            date_str = f"{day.strftime('%B %-d')} @ {rng.choice(['10:00 am', '6:30 pm'])}"
+        return {"source": source, "title": title, "date": date_str, "link": link}
+    return {"source": source, "title": title, "date": day.isoformat(),
+            "link": f"https://county10.com/events/#/details/{slug(title)}/{rng.randrange(10000, 20000)}"}
+
+
+def make_feeds(count, seed=42):
+    # -> [(source_name, record)]: clusters of 1-3 sources listing the same
+    # event under title variants, a share of weekly series, and a few
+    # unparseable dates ("TBA") that fall back to SCALE_NOW. Days stay about as
+    # busy as the real feeds, so larger sizes cover a longer horizon.
+    rng = random.Random(seed)
+    words = load_vocabulary()
+    sources = list(SOURCE_RANK.keys())
+    titles = [" ".join(rng.choice(words) for _ in range(rng.randint(2, 5))).title() for _ in range(max(count // 4, 1))]
+    start = date(SCALE_NOW.year, 1, 1)
+    span = max(365, count // SCALE_PER_DAY)
+    records = []
+    while len(records) < count:
+        title = rng.choice(titles)
+        day = start + timedelta(days=rng.randrange(span))
+        days = [day + timedelta(weeks=w) for w in range(rng.randint(2, 8))] if rng.random() < 0.15 else [day]
+        for source in rng.sample(sources, rng.choice([1, 1, 2, 2, 3])):
+            for d in days:
+                record = feed_record(source, rng.choice(TITLE_VARIANTS).format(title), d, rng)
+                if rng.random() < 0.005:
+                    record["date"] = "TBA"
+                records.append((source, record))
+    return records[:count]
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_scale(count):
+    # One size, in this process -> result dict
+    import resource
+    records = make_feeds(count)
+    repeat = 3 if count <= 10000 else 1
+    seconds = dict()
+
+    def parse_all():
+        set_reference_now(SCALE_NOW)  # cold date cache on every run
+        for source, r in records:
+            parse_event_date(r["date"], r["link"], source)
+    seconds["parse_event_date"] = best_time(parse_all, repeat)
+    set_reference_now(SCALE_NOW)
+    seconds["get_categories"] = best_time(lambda: [get_categories(r["title"], source) for source, r in records], repeat)
+
+    normalized = [normalize_event(r, source) for source, r in records]
+    del records
+    # add_event_smart mutates what it merges into, so every run gets its own copy
+    copies = [copy_events(normalized) for _ in range(repeat - 1)] + [normalized]
+    unique = []
+
+    def dedup_all():
+        reset_events()
+        for e in copies.pop():
+            add_event_smart(e)
+        unique[:] = [e for dl in stored_events.values() for e in dl]
+    seconds["add_event_smart"] = best_time(dedup_all, repeat)
+    del normalized
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            seconds["generate_html"] = best_time(lambda: generate_html(unique), repeat)
+        finally:
+            os.chdir(cwd)
+    reset_events()
+
+    # Every rate is per input event, so stages compare across sizes
+    return {
+        "events": count,
+        "unique": len(unique),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": {stage: {"seconds": round(t, 4), "events_per_sec": round(count / max(t, 1e-9))} for stage, t in seconds.items()}
+    }
+
+
+def machine_info():
+    # What timings depend on; the hostname isn't, so CI runners of one kind match
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo", "r", encoding='utf-8') as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return {"system": platform.system(), "arch": platform.machine(), "cpu": cpu,
+            "cpus": os.cpu_count(), "python": platform.python_version()}
+
+
+def compare_scale(results, baseline, same_machine=True):
+    regressions = []
+    for r in results:
+        base = baseline.get(str(r["events"]))
+        if not base:
+            continue
+        if r["unique"] != base["unique"]:
+            regressions.append(f"{r['events']} events: {base['unique']} -> {r['unique']} unique after dedup")
+        if not same_machine:
+            continue
+        for stage, s in r["stages"].items():
+            old = base["stages"].get(stage)
+            if old and s["events_per_sec"] < old["events_per_sec"] * (1 - THROUGHPUT_THRESHOLD):
+                regressions.append(f"{r['events']} events: {stage} {old['events_per_sec']}/s -> {s['events_per_sec']}/s")
+        if r["peak_rss_mb"] > base["peak_rss_mb"] * (1 + RSS_THRESHOLD):
+            regressions.append(f"{r['events']} events: peak RSS {base['peak_rss_mb']} MB -> {r['peak_rss_mb']} MB")
+    return regressions
+
+
+def bench_scale(counts, save_baseline=False):
+    results = []
+    for count in counts:
+        # Fresh interpreter per size: ru_maxrss never goes down
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "scale-run", str(count)],
+                             check=True, capture_output=True, text=True).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        results.append(r)
+        rates = " | ".join(f"{stage} {s['events_per_sec']:>9}/s" for stage, s in r["stages"].items())
+        print(f"📊 scale {count:>7} events ({r['unique']:>7} unique): {rates} | RSS {r['peak_rss_mb']:7.1f} MB")
+
+    baseline = {}
+    if os.path.exists(SCALE_BASELINE_FILE):
+        with open(SCALE_BASELINE_FILE, "r", encoding='utf-8') as f:
+            baseline = json.load(f)
+    machine = machine_info()
+    same_machine = baseline.get("machine") == machine
+    if baseline and not same_machine:
+        print(f"⚠️ Baseline was recorded on {baseline.get('machine')}; comparing unique counts only.")
+    regressions = compare_scale(results, baseline, same_machine)
+    for line in regressions:
+        print(f"❌ {line}")
+    if save_baseline:
+        if not same_machine:
+            baseline = {}  # timings from another machine don't mix with these
+        baseline.update({str(r["events"]): r for r in results}, machine=machine)
+        os.makedirs(os.path.dirname(SCALE_BASELINE_FILE), exist_ok=True)
+        with open(SCALE_BASELINE_FILE, "w", encoding='utf-8') as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"💾 Baseline saved to {SCALE_BASELINE_FILE}")
+    elif baseline and not regressions:
+        print("✅ No regressions against the baseline.")
+    return not regressions
+
+
+BENCHMARKS = {"dedup": bench_dedup, "categories": bench_categories, "memory": bench_memory, "payload": bench_payload}
+
+
+def main(argv):
+    if argv[:1] == ["scale-run"]:
+        print(json.dumps(run_scale(int(argv[1]))))
+        return
+    if argv[:1] == ["scale"]:
+        counts = [int(a) for a in argv if a.isdigit()] or SCALE_COUNTS
+        sys.exit(0 if bench_scale(counts, "--save-baseline" in argv) else 1)
+    names = [a for a in argv if a in BENCHMARKS] or list(BENCHMARKS)
+    counts = [int(a) for a in argv if a.isdigit()] or [10000, 100000]
+    ok = all([BENCHMARKS[name](c) for name in names for c in counts])
+    reset_events()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
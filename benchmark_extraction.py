@@ -0,0 +1,159 @@
+import asyncio
+import os
+import re
+import sys
+import time
+from playwright.async_api import async_playwright
+
+import scrape_county10
+import scrape_chamber
+import scrape_cwc
+import scrape_windriver
+
+# Usage: python benchmark_extraction.py [copies]
+# Loads each widget's saved list page from fixtures/<name>.html (its body
+# repeated `copies` times for bigger pages), then times the old per-element
+# extraction against the batched evaluate_all extraction and checks both
+# return the same events. Exits 1 on a mismatch or an empty extraction.
+#
+# python benchmark_extraction.py capture [name ...]
+# Saves each site's live list page, once its cards have rendered, over
+# fixtures/<name>.html. Scripts are stripped so the saved page is static.
+
+FIXTURE_DIR = "fixtures"
+
+# name -> (list page the scraper opens, selector its cards render under)
+CAPTURE_PAGES = {
+    "county10": ("https://county10.com/events/#/", ".csEventTile"),
+    "chamber": ("https://info.landerchamber.org/events", ".gz-list-card-wrapper"),
+    "cwc": ("https://www.cwc.edu/calendar/", ".tribe-events-calendar-list__event-row"),
+    "windriver": ("https://windriver.org/events/", ".type-tribe_events")
+}
+
+
+# --- Reference: the original per-element extraction loops ---
+async def legacy_county10(page):
+    events = []
+    for card in await page.query_selector_all(".csEventTile"):
+        iso_date_raw = await card.get_attribute("data-date")
+        title_el = await card.query_selector(".csOneLine")
+        title = await title_el.inner_text() if title_el else "Unknown"
+        link = ""
+        anchor = await card.query_selector("a")
+        if anchor: link = await anchor.get_attribute("href")
+        if link and link.startswith("#"):
+            link = "https://county10.com/events/" + link
+        if iso_date_raw:
+            events.append({"source": "County 10", "title": title.strip(), "date": iso_date_raw.split("T")[0], "link": link})
+    return events
+
+
+async def legacy_chamber(page):
+    events = []
+    for card in await page.query_selector_all(".gz-list-card-wrapper"):
+        title_el = await card.query_selector(".gz-card-title a")
+        date_el = await card.query_selector(".gz-card-date")
+        if title_el:
+            title = await title_el.inner_text()
+            link = await title_el.get_attribute("href")
+            date = await date_el.inner_text() if date_el else "Check Website"
+            events.append({"source": "Lander Chamber", "title": title.strip(), "date": date.strip(), "link": link})
+    return events
+
+
+async def legacy_cwc(page):
+    events = []
+    for row in await page.query_selector_all(".tribe-events-calendar-list__event-row"):
+        title_el = await row.query_selector(".tribe-events-calendar-list__event-title-link")
+        time_el = await row.query_selector("time")
+        if title_el:
+            title = await title_el.inner_text()
+            link = await title_el.get_attribute("href")
+            date_str = await time_el.get_attribute("datetime") if time_el else ""
+            if not date_str and time_el:
+                date_str = await time_el.inner_text()
+            events.append({"source": "CWC", "title": title.strip(), "date": date_str, "link": link})
+    return events
+
+
+async def legacy_windriver(page):
+    events = []
+    for card in await page.query_selector_all(".type-tribe_events"):
+        title_el = await card.query_selector(".tribe-events-list-event-title a")
+        date_el = await card.query_selector(".tribe-event-date-start")
+        if title_el and date_el:
+            title = await title_el.inner_text()
+            link = await title_el.get_attribute("href")
+            date_str = await date_el.inner_text()
+            events.append({"source": "Wind River", "title": title.strip(), "date": date_str.strip(), "link": link})
+    return events
+
+
+FIXTURES = [
+    ("county10", legacy_county10, scrape_county10.extract_cards),
+    ("chamber", legacy_chamber, scrape_chamber.extract_cards),
+    ("cwc", legacy_cwc, scrape_cwc.extract_rows),
+    ("windriver", legacy_windriver, scrape_windriver.extract_cards)
+]
+
+
+def fixture_html(name, copies):
+    with open(os.path.join(FIXTURE_DIR, f"{name}.html"), "r", encoding="utf-8") as f:
+        page = f.read()
+    body = re.search(r'(<body[^>]*>)(.*)(</body>)', page, re.S)
+    return page[:body.start(2)] + body.group(2) * copies + page[body.end(2):]
+
+
+async def capture(names):
+    ok = True
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        for name in names:
+            url, selector = CAPTURE_PAGES[name]
+            try:
+                await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+                await page.wait_for_selector(selector, state="visible", timeout=20000)
+            except Exception as e:
+                print(f"❌ {name}: {url} did not render {selector}: {e}")
+                ok = False
+                continue
+            await page.evaluate("() => document.querySelectorAll('script, noscript').forEach(el => el.remove())")
+            html = await page.content()
+            cards = await page.locator(selector).count()
+            with open(os.path.join(FIXTURE_DIR, f"{name}.html"), "w", encoding="utf-8") as f:
+                f.write(f"<!-- Saved from {url} on {time.strftime('%Y-%m-%d')} -->\n" + html)
+            print(f"💾 {name:<10} {cards:>5} cards saved to {FIXTURE_DIR}/{name}.html")
+        await browser.close()
+    return ok
+
+
+async def run(copies):
+    ok = True
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        for name, legacy, batched in FIXTURES:
+            await page.set_content(fixture_html(name, copies))
+
+            t0 = time.perf_counter()
+            old = await legacy(page)
+            t_old = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            new = await batched(page)
+            t_new = time.perf_counter() - t0
+
+            # Source labels differ only where a scraper renamed its constant
+            same = [(e["title"], e["date"], e["link"]) for e in old] == [(e["title"], e["date"], e["link"]) for e in new]
+            ok = ok and same and bool(new)
+            print(f"📊 {name:<10} {len(new):>5} cards: per-element {t_old * 1000:8.1f} ms | batched {t_new * 1000:7.1f} ms | "
+                  f"{t_old / max(t_new, 1e-9):5.1f}x | {'✅ identical' if same else '❌ MISMATCH'}")
+        await browser.close()
+    return ok
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["capture"]:
+        sys.exit(0 if asyncio.run(capture(sys.argv[2:] or list(CAPTURE_PAGES))) else 1)
+    sys.exit(0 if asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 1)) else 1)
@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from playwright.async_api import async_playwright
+
+import http_pool
+import scrape_state
+from scrape_all import SCRAPERS, shared_launch_args
+
+# Usage:
+#   python benchmark_scrapers.py record [--only NAME]     (hits the live sites once)
+#   python benchmark_scrapers.py replay [--runs 3] [--save-baseline]
+#
+# record: runs every scraper normally and keeps its traffic in
+#   fixtures/<source>/site.har   browser traffic (Playwright HAR, bodies embedded)
+#   fixtures/<source>/http.json  API exchanges made through http_pool (plain
+#                                HTTP and context.request), plus the clock
+# Nothing is written to the *_data.json files.
+#
+# replay: serves the HAR through Playwright routing and http.json from a local
+# keep-alive server, runs each scraper offline and reports wall time, round
+# trips and events/sec. The scrapers and the browser see the recorded "now",
+# so date windows match the recording. Results are compared with
+# fixtures/benchmark_baseline.json and the exit code is 1 when a source got
+# slower than THRESHOLD, needed more round trips, returned different events or
+# made an API request that was never recorded.
+
+FIXTURE_DIR = "fixtures"
+BASELINE_FILE = os.path.join(FIXTURE_DIR, "benchmark_baseline.json")
+THRESHOLD = 0.20
+TIMEOUT = 600
+# Headers the replay server hands back; the rest are connection details
+REPLAY_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+
+def fixture_paths(name):
+    base = os.path.join(FIXTURE_DIR, re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_'))
+    return os.path.join(base, "site.har"), os.path.join(base, "http.json")
+
+
+def exchange_key(method, path, data):
+    return f"{method} {path} {data or ''}"
+
+
+def start_replay_server(exchanges):
+    # Last recording of a request wins, the same way a live site answers "now"
+    responses = {exchange_key(e.get("method", "GET"), e["path"], e.get("data")): e for e in exchanges}
+    hits = {"count": 0, "missed": []}
+
+    class Replay(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            hits["count"] += 1
+            length = int(self.headers.get("Content-Length") or 0)
+            data = self.rfile.read(length).decode("utf-8", "replace") if length else ""
+            key = exchange_key(self.command, self.path, data)
+            exchange = responses.get(key)
+            if exchange is None:
+                hits["missed"].append(key)
+            status = exchange["status"] if exchange else 404
+            body = exchange["body"].encode("utf-8") if exchange else b"not recorded"
+            self.send_response(status)
+            for header, value in (exchange or {}).get("headers", {}).items():
+                if header.title() in REPLAY_HEADERS:
+                    self.send_header(header, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_POST = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Replay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+async def run_source(browser, name, module, mode):
+    har_path, bundle_path = fixture_paths(name)
+    context = await browser.new_context(**module.CONTEXT_OPTIONS)
+    browser_requests = {"count": 0}
+    context.on("request", lambda request: browser_requests.__setitem__("count", browser_requests["count"] + 1))
+
+    server = None
+    if mode == "record":
+        os.makedirs(os.path.dirname(har_path), exist_ok=True)
+        await context.route_from_har(har_path, update=True, update_content="embed")
+        http_pool.RECORDER = []
+        frozen = datetime.now().replace(microsecond=0)
+    else:
+        if os.path.exists(har_path):
+            await context.route_from_har(har_path, not_found="abort")
+        else:
+            await context.route("**/*", lambda route: route.abort())
+        bundle = {"exchanges": []}
+        if os.path.exists(bundle_path):
+            with open(bundle_path, "r", encoding="utf-8") as f:
+                bundle = json.load(f)
+        if "now" not in bundle:
+            raise SystemExit(f"❌ {bundle_path} has no recorded clock; run `record --only \"{name}\"` again.")
+        frozen = datetime.fromisoformat(bundle["now"])
+        server, hits = start_replay_server(bundle["exchanges"])
+        # Every API request goes to the replay server, never the network
+        http_pool.HOST_MAP = {"*": f"http://127.0.0.1:{server.server_port}"}
+    # Same "now" for the scrapers' date windows and the page's own Date()
+    scrape_state.NOW = frozen
+    await context.clock.set_fixed_time(frozen)
+
+    started = time.perf_counter()
+    try:
+        events = await asyncio.wait_for(module.collect_events(context), TIMEOUT)
+    finally:
+        seconds = time.perf_counter() - started
+        await context.close()  # also writes the HAR in record mode
+        scrape_state.NOW = None
+        http_requests = len(http_pool.RECORDER) if mode == "record" else hits["count"]
+        missed = [] if mode == "record" else hits["missed"]
+        if mode == "record":
+            with open(bundle_path, "w", encoding="utf-8") as f:
+                json.dump({"source": name, "now": frozen.isoformat(), "exchanges": http_pool.RECORDER}, f, indent=1)
+            http_pool.RECORDER = None
+        if server:
+            server.shutdown()
+            http_pool.HOST_MAP = {}
+
+    return {
+        "source": name,
+        "events": len(events),
+        "seconds": round(seconds, 3),
+        "round_trips": browser_requests["count"] + http_requests,
+        "events_per_sec": round(len(events) / max(seconds, 1e-9), 1),
+        "unrecorded": missed,
+        "fingerprint": sorted(f"{e['title']}|{e['date']}|{e['link']}" for e in events)
+    }
+
+
+def compare(results, baseline):
+    regressions = []
+    for r in results:
+        for key in r.get("unrecorded", ()):
+            regressions.append(f"{r['source']}: request not in the recording: {key[:120]}")
+        base = baseline.get(r["source"])
+        if not base:
+            continue
+        if r["seconds"] > base["seconds"] * (1 + THRESHOLD):
+            regressions.append(f"{r['source']}: {base['seconds']:.2f}s -> {r['seconds']:.2f}s")
+        if r["round_trips"] > base["round_trips"]:
+            regressions.append(f"{r['source']}: {base['round_trips']} -> {r['round_trips']} round trips")
+        if r["fingerprint"] != base["fingerprint"]:
+            regressions.append(f"{r['source']}: events differ from baseline ({base['events']} -> {r['events']})")
+    return regressions
+
+
+async def main_async(mode, only, runs, save_baseline):
+    scrapers = [(name, module) for name, module in SCRAPERS if not only or name in only]
+    # Full crawls only, and keep the real .scrape_state untouched
+    scrape_state.FORCE_FULL = True
+    scrape_state.STATE_DIR = tempfile.mkdtemp(prefix="scrape_state_")
+
+    results = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=shared_launch_args(scrapers))
+        for name, module in scrapers:
+            print(f"🎬 [{name}] {mode}...")
+            samples = []
+            for _ in range(runs if mode == "replay" else 1):
+                samples.append(await run_source(browser, name, module, mode))
+            result = dict(samples[-1], seconds=statistics.median(s["seconds"] for s in samples))
+            result["events_per_sec"] = round(result["events"] / max(result["seconds"], 1e-9), 1)
+            results.append(result)
+        await browser.close()
+
+    print("\n📊 Scraper benchmark" + (" (replayed)" if mode == "replay" else " (live, recorded)"))
+    for r in results:
+        print(f"   {r['source']:<15} {r['events']:>5} events  {r['seconds']:>7.2f}s  "
+              f"{r['round_trips']:>5} round trips  {r['events_per_sec']:>8.1f} events/s")
+    if mode == "record":
+        return 0
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline)
+    for line in regressions:
+        print(f"❌ {line}")
+    if save_baseline:
+        baseline.update({r["source"]: {k: v for k, v in r.items() if k != "unrecorded"} for r in results})
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1)
+        print(f"💾 Baseline saved to {BASELINE_FILE}")
+    elif baseline and not regressions:
+        print("✅ No regressions against the baseline.")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record scraper traffic, or benchmark scrapers against a recording.")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--only", action="append", help="limit to a source name (repeatable)")
+    parser.add_argument("--runs", type=int, default=3, help="replay runs per source (median is reported)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these replay results as the baseline")
+    args = parser.parse_args(argv)
+    return asyncio.run(main_async(args.mode, args.only, args.runs, args.save_baseline))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+from urllib.parse import urlsplit
+
+# Lean browser profile shared by the Playwright scrapers. None of them read
+# images, fonts, media, ads or analytics, so those requests are aborted at the
+# context's router before they reach the network. Only routing changes here:
+# each source's LAUNCH_ARGS / CONTEXT_OPTIONS (the County 10 stealth settings)
+# are left exactly as they are.
+
+BLOCKED_TYPES = {"image", "font", "media"}
+
+# Ad / analytics / tracking hosts (any subdomain)
+BLOCKED_HOSTS = (
+    "googlesyndication.com", "doubleclick.net", "googleadservices.com", "adservice.google.com",
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com", "analytics.google.com",
+    "facebook.net", "facebook.com", "hotjar.com", "clarity.ms", "quantserve.com", "scorecardresearch.com",
+    "newrelic.com", "nr-data.net", "adsrvr.org", "amazon-adsystem.com", "taboola.com", "outbrain.com"
+)
+
+# Extra hosts per source, on top of the shared lists
+SOURCE_POLICIES = {
+    "County 10": {"hosts": ("citysparkstorage.blob.core.windows.net",)},
+}
+
+# Rough transfer size of what we abort, for the savings log. We never see
+# the real bytes of a request we didn't make, so this is an estimate.
+TYPICAL_BYTES = {"image": 60000, "font": 35000, "media": 400000, "script": 45000}
+DEFAULT_BYTES = 15000
+
+BLOCK_STATS = dict()
+
+
+def host_blocked(host, hosts):
+    return any(host == h or host.endswith("." + h) for h in hosts)
+
+
+async def apply_profile(context, source_name):
+    """Install the blocking policy for `source_name` on every page of `context`."""
+    hosts = BLOCKED_HOSTS + SOURCE_POLICIES.get(source_name, {}).get("hosts", ())
+    stats = BLOCK_STATS.setdefault(source_name, {"requests": 0, "blocked": 0, "bytes": 0, "by_type": {}})
+
+    async def route(route):
+        request = route.request
+        stats["requests"] += 1
+        kind = request.resource_type
+        if kind in BLOCKED_TYPES or host_blocked(urlsplit(request.url).hostname or "", hosts):
+            stats["blocked"] += 1
+            stats["bytes"] += TYPICAL_BYTES.get(kind, DEFAULT_BYTES)
+            stats["by_type"][kind] = stats["by_type"].get(kind, 0) + 1
+            await route.abort()
+        else:
+            await route.fallback()
+
+    await context.route("**/*", route)
+
+
+def blocked_requests(source_name):
+    return BLOCK_STATS.get(source_name, {}).get("blocked", 0)
+
+
+def report_blocking(source_name):
+    stats = BLOCK_STATS.get(source_name)
+    if not stats or not stats["requests"]:
+        return
+    kinds = ", ".join(f"{k} {n}" for k, n in sorted(stats["by_type"].items()))
+    print(f"🚫 {source_name}: blocked {stats['blocked']} of {stats['requests']} requests "
+          f"(~{stats['bytes'] / 1e6:.1f} MB avoided; {kinds})")
@@ -1,8 +1,19 @@
+import argparse
+import base64
+import cProfile
+import hashlib
 import json
 import os
-from datetime import datetime
+import pstats
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import re
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from difflib import SequenceMatcher
+from functools import lru_cache
+import event_store
 # No typing needed
 
 # --- CONFIGURATION ---
@@ -62,69 +73,194 @@ CATEGORY_WEIGHTS = {
     }
 }
 
+# --- BUILD METRICS ---
+# Stage timings (seconds) and counters for one build, written to
+# build_metrics.json. Workers fill their own dict and hand it back with
+# their result, so nothing is shared between threads or lost in processes.
+METRICS_FILE = "build_metrics.json"
+
+def new_metrics():
+    return {"stages": {}, "counters": {}, "merges": {}}
+
+build_metrics = new_metrics()
+
+def add_time(stage, seconds, metrics=None):
+    stages = (build_metrics if metrics is None else metrics)["stages"]
+    stages[stage] = stages.get(stage, 0.0) + seconds
+
+def count(name, n=1, metrics=None):
+    counters = (build_metrics if metrics is None else metrics)["counters"]
+    counters[name] = counters.get(name, 0) + n
+
+@contextmanager
+def timed(stage, metrics=None):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(stage, time.perf_counter() - started, metrics)
+
+def merge_metrics(metrics):
+    for section in ("stages", "counters", "merges"):
+        target = build_metrics[section]
+        for k, v in metrics[section].items():
+            target[k] = target.get(k, 0) + v
+
+def reset_metrics():
+    build_metrics.clear()
+    build_metrics.update(new_metrics())
+
 # --- PART 1: DATE PARSER ---
-def parse_event_date(date_str, link_str=""):
-    current_year = datetime.now().year
-    iso_check = re.search(r'(\d{4}-\d{2}-\d{2})', str(date_str))
+ISO_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+MONTH_DAY_RE = re.compile(r'([A-Za-z]{3,9})\s+(\d{1,2})')
+YEAR_RE = re.compile(r'\d{4}')
+
+# One reference "now" per build so every relative date agrees with the others
+reference_now = datetime.now()
+date_fallbacks = dict()
+
+def set_reference_now(now=None):
+    global reference_now
+    reference_now = now or datetime.now()
+    cached_parse.cache_clear()
+    date_fallbacks.clear()
+
+def parse_generic_date(date_str, link_str=""):
+    # Returns None when nothing date-like was found
+    iso_check = ISO_DATE_RE.search(str(date_str))
     if iso_check: return iso_check.group(1)
     if link_str:
-        url_match = re.search(r'(\d{4}-\d{2}-\d{2})', link_str)
+        url_match = ISO_DATE_RE.search(link_str)
         if url_match: return url_match.group(1)
     clean_text = str(date_str).replace('at', '@').replace(',', '').replace('.', '')
     try:
-        date_match = re.search(r'([A-Za-z]{3,9})\s+(\d{1,2})', clean_text)
+        date_match = MONTH_DAY_RE.search(clean_text)
         if date_match:
             month, day = date_match.groups()
             fmt = "%b" if len(month) == 3 else "%B"
-            year = current_year
-            year_match = re.search(r'\d{4}', clean_text)
+            year = reference_now.year
+            year_match = YEAR_RE.search(clean_text)
             if year_match: year = int(year_match.group(0))
             dt = datetime.strptime(f"{month} {day} {year}", f"{fmt} %d %Y")
             return dt.strftime("%Y-%m-%d")
     except:
         pass
-    return datetime.now().strftime("%Y-%m-%d")
+    return None
+
+def parse_event_date(date_str, link_str="", source=None):
+    iso_date, fell_back = cached_parse(str(date_str), link_str or "", source)
+    if fell_back:
+        key = source or "Unknown"
+        date_fallbacks[key] = date_fallbacks.get(key, 0) + 1
+    return iso_date
 
 # --- PART 2: SMART CATEGORY SCORING ---
-def get_categories(title, source):
-    title_lower = title.lower()
-    
-    # Use a list of tuples to avoid dictionary-access linter bugs
-    scoring_results = []
-    
-    for cat, data in CATEGORY_WEIGHTS.items():
-        # 1. Source Boost
+FESTIVAL_KEYWORDS = ["festival", "fest", "fair", "parade", "celebration", "market"]
+FESTIVAL_TAG = "__festival__"
+
+INFLECTIONS = r'(?:e?s|ed|ers?|ing)?'
+
+def keyword_stem(keyword):
+    # Literal text every form of the keyword starts with ("hike" -> "hik")
+    return keyword[:-1] if keyword[-1] in "ey" and len(keyword) > 3 else keyword
+
+def keyword_pattern(keyword):
+    # Keywords are whole words with simple inflections ("climb" -> "Climbers",
+    # "run" -> "Running", "hike" -> "Hiking", "family" -> "Families"), so "aa"
+    # doesn't hit "Bazaar", "break" "Breakfast" or "play" "Playground".
+    stem = keyword_stem(keyword)
+    body = re.escape(stem)
+    if keyword[-1] == "e" and stem != keyword:
+        return r'\b' + body + r'(?:e(?:s|d|rs?)?|ing)\b'
+    if stem != keyword:
+        body += "(?:y|ie)"
+    elif keyword[-1].isalpha():
+        body += re.escape(keyword[-1]) + "?"  # doubled consonant
+    return r'\b' + body + INFLECTIONS + r'\b'
+
+def build_category_matcher(category_weights):
+    owners = dict()
+    for cat, data in category_weights.items():
+        for k in data.get("keywords", []):
+            owners.setdefault(k, []).append(cat)
+    for k in FESTIVAL_KEYWORDS:
+        owners.setdefault(k, []).append(FESTIVAL_TAG)
+
+    # One alternation of keyword stems tried at every word start, longest
+    # first. A lookahead at each position can only report one alternative, so
+    # every stem also carries the keywords whose stems it starts with
+    # ("art center" -> "art"); their full patterns decide.
+    keywords = sorted(owners, key=lambda k: (-len(k), k))
+    stems = sorted({keyword_stem(k) for k in keywords}, key=lambda t: (-len(t), t))
+    implied = dict()
+    for t in stems:
+        implied[t] = [k for k in keywords if t.startswith(keyword_stem(k))]
+    alternation = "|".join(re.escape(t) for t in stems)
+    regex = re.compile(r'\b(?=(' + alternation + r'))')
+    patterns = {k: re.compile(keyword_pattern(k)) for k in keywords}
+
+    boosts = dict()
+    for cat, data in category_weights.items():
         boost_data = data.get("source_boost", {})
-        boost_val = 0
         if isinstance(boost_data, dict):
-            boost_val = boost_data.get(source, 0)
-            
-        # 2. Keyword Match
-        keywords = data.get("keywords", [])
-        kw_matches = [k for k in keywords if k in title_lower]
-        keyword_score = len(kw_matches) * 4
-        
-        total_score = boost_val + keyword_score
-        scoring_results.append((cat, total_score))
-        
-    # Determine winner
-    active_winners = [x for x in scoring_results if x[1] > 0]
-    
+            for src, val in boost_data.items():
+                boosts.setdefault(src, dict())[cat] = val
+
+    return {
+        "regex": regex,
+        "patterns": patterns,
+        "implied": implied,
+        "owners": owners,
+        "order": list(category_weights.keys()),
+        "boosts": boosts
+    }
+
+CATEGORY_MATCHER = build_category_matcher(CATEGORY_WEIGHTS)
+
+def match_keywords(title_lower, matcher=CATEGORY_MATCHER):
+    found = set()
+    patterns = matcher["patterns"]
+    for m in matcher["regex"].finditer(title_lower):
+        stem = m.group(1)
+        # The longest candidate may still fail the whole-word rule ("aa" in "aab")
+        for k in matcher["implied"][stem]:
+            if k not in found and patterns[k].match(title_lower, m.start()):
+                found.add(k)
+    return found
+
+def get_categories(title, source):
+    title_lower = title.lower()
+    matcher = CATEGORY_MATCHER
+
+    # 1. Source Boost
+    scores = dict(matcher["boosts"].get(source, {}))
+
+    # 2. Keyword Match (each distinct keyword scores once)
+    found = match_keywords(title_lower, matcher)
+    festival = False
+    for k in found:
+        for cat in matcher["owners"][k]:
+            if cat == FESTIVAL_TAG:
+                festival = True
+            else:
+                scores[cat] = scores.get(cat, 0) + 4
+
+    # Determine winner: highest score, ties go to taxonomy order
     current_categories = []
-    if active_winners:
-        # Sort by score desc
-        active_winners.sort(key=lambda x: x[1], reverse=True)
-        primary = active_winners[0][0]
-        current_categories.append(primary)
+    best_cat, best_score = None, 0
+    for cat in matcher["order"]:
+        if scores.get(cat, 0) > best_score:
+            best_cat, best_score = cat, scores[cat]
+    if best_cat:
+        current_categories.append(best_cat)
     else:
         current_categories.append("Community & Social")
 
     # 3. Apply "Festival Rule"
-    festival_keywords = ["festival", "fest", "fair", "parade", "celebration", "market"]
-    if any(k in title_lower for k in festival_keywords):
+    if festival:
         if "Community & Social" not in current_categories:
             current_categories.append("Community & Social")
-        if "market" in title_lower and "Food & Drink" not in current_categories:
+        if "market" in found and "Food & Drink" not in current_categories:
              current_categories.append("Food & Drink")
 
     return current_categories
@@ -132,27 +268,95 @@ def get_categories(title, source):
 # --- PART 3: ADVANCED DEDUPLICATION ---
 stored_events = dict() 
 
+# Per-date candidate index so add_event_smart only runs SequenceMatcher on
+# events that could plausibly match instead of every event on that date.
+#   date -> {"entries": [...], "exact": {clean: [pos]}, "url": {url: [pos]}, "grams": {bigram: [pos]}}
+dedup_index = dict()
+
+TITLE_NOISE_RE = re.compile(r'\b(the|annual|monthly|weekly|meeting|of)\b')
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+FUZZY_MIN_LEN = 5
+FUZZY_THRESHOLD = 0.75
+
+def clean_title(t):
+    t = t.lower()
+    t = TITLE_NOISE_RE.sub('', t)
+    return NON_ALNUM_RE.sub('', t)
+
+def title_bigrams(t):
+    # A ratio above 0.75 between two titles of 5+ chars is impossible without
+    # at least one shared bigram, so bigram buckets never drop a real match.
+    return {t[i:i + 2] for i in range(len(t) - 1)}
+
+def char_counts(t):
+    counts = dict()
+    for ch in t: counts[ch] = counts.get(ch, 0) + 1
+    return counts
+
+def titles_match(t1, t2, counts1=None, counts2=None):
+    if t1 == t2: return True
+    if len(t1) < FUZZY_MIN_LEN or len(t2) < FUZZY_MIN_LEN: return False
+    # Cheap upper bounds first; ratio() can never exceed either of them.
+    total = len(t1) + len(t2)
+    if 2 * min(len(t1), len(t2)) <= FUZZY_THRESHOLD * total: return False
+    if counts1 is None: counts1 = char_counts(t1)
+    if counts2 is None: counts2 = char_counts(t2)
+    overlap = sum(min(n, counts2.get(ch, 0)) for ch, n in counts1.items())
+    if 2 * overlap <= FUZZY_THRESHOLD * total: return False
+    count("sequence_matcher_calls")
+    return SequenceMatcher(None, t1, t2).ratio() > FUZZY_THRESHOLD
+
 def is_same_event(evt1, evt2):
     if evt1['url'] and evt2['url'] and evt1['url'] != '#' and evt1['url'] == evt2['url']:
         return True
     if evt1['start'] != evt2['start']: return False
-    def clean(t): 
-        t = t.lower()
-        t = re.sub(r'\b(the|annual|monthly|weekly|meeting|of)\b', '', t)
-        return re.sub(r'[^a-z0-9]', '', t)
-    t1, t2 = clean(evt1['title']), clean(evt2['title'])
-    if t1 == t2: return True
-    if len(t1) < 5 or len(t2) < 5: return False
-    return SequenceMatcher(None, t1, t2).ratio() > 0.75
+    return titles_match(clean_title(evt1['title']), clean_title(evt2['title']))
+
+def index_entry(index, pos):
+    entry = index["entries"][pos]
+    event = entry["event"]
+    index["exact"].setdefault(entry["clean"], []).append(pos)
+    if event['url'] and event['url'] != '#':
+        index["url"].setdefault(event['url'], []).append(pos)
+    if len(entry["clean"]) >= FUZZY_MIN_LEN:
+        for gram in title_bigrams(entry["clean"]):
+            index["grams"].setdefault(gram, []).append(pos)
+
+def find_candidates(index, event, cleaned):
+    candidates = set(index["exact"].get(cleaned, ()))
+    if event['url'] and event['url'] != '#':
+        candidates.update(index["url"].get(event['url'], ()))
+    if len(cleaned) >= FUZZY_MIN_LEN:
+        for gram in title_bigrams(cleaned):
+            candidates.update(index["grams"].get(gram, ()))
+    # Insertion order keeps "first stored match wins" identical to a linear scan.
+    return sorted(candidates)
 
 def add_event_smart(new_event):
     date_key = new_event['start']
     if date_key not in stored_events: stored_events[date_key] = []
+    if date_key not in dedup_index:
+        dedup_index[date_key] = {"entries": [], "exact": {}, "url": {}, "grams": {}}
+    index = dedup_index[date_key]
+    cleaned = clean_title(new_event['title'])
+    counts = char_counts(cleaned)
     merged = False
-    for existing_event in stored_events[date_key]:
-        if is_same_event(new_event, existing_event):
-            new_rank = SOURCE_RANK.get(new_event['extendedProps']['source'], 99)
-            old_rank = SOURCE_RANK.get(existing_event['extendedProps']['source'], 99)
+    candidates = find_candidates(index, new_event, cleaned)
+    count("dedup_events")
+    count("dedup_candidates", len(candidates))
+    for pos in candidates:
+        entry = index["entries"][pos]
+        existing_event = entry["event"]
+        same_url = new_event['url'] and existing_event['url'] and new_event['url'] != '#' and new_event['url'] == existing_event['url']
+        if same_url or titles_match(cleaned, entry["clean"], counts, entry["counts"]):
+            new_source = new_event['extendedProps']['source']
+            old_source = existing_event['extendedProps']['source']
+            new_rank = SOURCE_RANK.get(new_source, 99)
+            old_rank = SOURCE_RANK.get(old_source, 99)
+            # "kept <- dropped", by source
+            pair = f"{new_source} <- {old_source}" if new_rank < old_rank else f"{old_source} <- {new_source}"
+            build_metrics["merges"][pair] = build_metrics["merges"].get(pair, 0) + 1
+            count("url_merges" if same_url else "title_merges")
             if new_rank < old_rank:
                 existing_event['title'] = new_event['title']
                 existing_event['url'] = new_event['url']
@@ -160,39 +364,666 @@ def add_event_smart(new_event):
                 existing_event['textColor'] = new_event['textColor']
                 existing_event['extendedProps']['source'] = new_event['extendedProps']['source']
                 existing_event['extendedProps']['categories'] = new_event['extendedProps']['categories'] 
+                # Stale buckets only add extra candidates; re-index under the new title/url.
+                entry["clean"] = cleaned
+                entry["counts"] = counts
+                index_entry(index, pos)
             merged = True
             break
-    if not merged: stored_events[date_key].append(new_event)
+    if not merged:
+        stored_events[date_key].append(new_event)
+        index["entries"].append({"event": new_event, "clean": cleaned, "counts": counts})
+        index_entry(index, len(index["entries"]) - 1)
+
+def reset_events():
+    stored_events.clear()
+    dedup_index.clear()
 
 # --- PART 4: LOAD DATA ---
+MONTH_NUMBERS = dict()
+for month_num in range(1, 13):
+    month_name = datetime(2000, month_num, 1).strftime("%B")
+    MONTH_NUMBERS[month_name.lower()] = month_num
+    MONTH_NUMBERS[month_name[:3].lower()] = month_num
+MONTH_NUMBERS["sept"] = 9
+WRVC_DATE_RE = re.compile(r'([A-Za-z]+) (\d{1,2}) @')
+
+# Fast paths for feeds with a known date format. Each returns None when the
+# value doesn't look the way it should, which drops back to parse_generic_date.
+def parse_iso_prefix(date_str, link_str):
+    # County 10 / CWC send "2026-02-15"; LVHS sends "2026-02-16T00:00:00.000-07:00"
+    # and the local calendar date is the part before the "T".
+    head = date_str[:10]
+    if len(head) == 10 and head[4] == '-' and head[7] == '-' and head[:4].isdigit() and head[5:7].isdigit() and head[8:].isdigit():
+        return head
+    return None
+
+def parse_wrvc_date(date_str, link_str):
+    # REST feed: "2026-02-15T08:00:00"
+    iso = parse_iso_prefix(date_str, link_str)
+    if iso: return iso
+    # Browser feed: "February 15 @ 8:00 am"; recurring events carry the real date in the link
+    if link_str:
+        url_match = ISO_DATE_RE.search(link_str)
+        if url_match: return url_match.group(1)
+    m = WRVC_DATE_RE.match(date_str)
+    if not m: return None
+    month = MONTH_NUMBERS.get(m.group(1).lower())
+    if not month: return None
+    try:
+        return datetime(reference_now.year, month, int(m.group(2))).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+DATE_PARSERS = {
+    "County 10": parse_iso_prefix,
+    "CWC": parse_iso_prefix,
+    "LVHS": parse_iso_prefix,
+    "WRVC": parse_wrvc_date
+}
+DATE_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def cached_parse(date_str, link_str, source):
+    # -> (iso_date, fell_back_to_today)
+    fast = DATE_PARSERS.get(source)
+    iso_date = fast(date_str, link_str) if fast else None
+    if iso_date is None:
+        iso_date = parse_generic_date(date_str, link_str)
+    if iso_date is None:
+        return reference_now.strftime("%Y-%m-%d"), True
+    return iso_date, False
+
+def normalize_event(e, source_name, metrics=None):
+    started = time.perf_counter()
+    iso_date = parse_event_date(e['date'], e.get('link', ''), source_name)
+    parsed = time.perf_counter()
+    categories = get_categories(e['title'], source_name)
+    add_time("parse_dates", parsed - started, metrics)
+    add_time("categorize", time.perf_counter() - parsed, metrics)
+    style = SOURCE_COLORS.get(source_name, {'bg': '#3788d8', 'text': 'white'})
+    return {
+        "title": e['title'],
+        "start": iso_date,
+        "allDay": True,
+        "url": e.get('link', '#'),
+        "color": style['bg'],
+        "textColor": style['text'],
+        "extendedProps": {
+            "source": source_name,
+            "categories": categories
+        }
+    }
+
+STREAM_CHUNK_SIZE = 1 << 16
+
+def iter_json_array(f, buf, decoder):
+    # Decodes one array element at a time so only the current chunk is held
+    pos = buf.index('[') + 1
+    eof = False
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(buf) or buf[pos] != ']':
+            try:
+                obj, end = decoder.raw_decode(buf, pos) if pos < len(buf) else (None, None)
+            except json.JSONDecodeError:
+                obj, end = None, None
+            # A value that runs to the end of the buffer may still be incomplete
+            if end is None or (end == len(buf) and not eof):
+                more = f.read(STREAM_CHUNK_SIZE)
+                if not more:
+                    if eof: raise json.JSONDecodeError("Unterminated JSON array", buf, pos)
+                    eof = True
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+            yield obj
+            pos = end
+            if pos > STREAM_CHUNK_SIZE:
+                buf, pos = buf[pos:], 0
+        else:
+            return
+
+def iter_source_records(filename):
+    # Accepts a JSON array (what the scrapers write) or JSON Lines
+    decoder = json.JSONDecoder()
+    with open(filename, "r", encoding='utf-8') as f:
+        buf = f.read(STREAM_CHUNK_SIZE)
+        if buf.lstrip().startswith('['):
+            yield from iter_json_array(f, buf, decoder)
+            return
+        f.seek(0)
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+# Set by --store: read feeds from the SQLite event store (optionally only
+# days inside store_window) instead of parsing the JSON exports.
+event_store_path = None
+store_window = (None, None)
+
+def set_event_store(path=None, window=(None, None)):
+    global event_store_path, store_window
+    event_store_path = path
+    store_window = window
+
+def stored_snapshot(filename):
+    return event_store.feed_snapshot(filename, event_store_path) if event_store_path else None
+
+def source_available(filename):
+    return stored_snapshot(filename) is not None or os.path.exists(filename)
+
+def source_records(filename):
+    # Feeds missing from the store (e.g. never scraped into it) fall back to their JSON file
+    if stored_snapshot(filename) is not None:
+        return event_store.query_events(filename, store_window[0], store_window[1], event_store_path)
+    return iter_source_records(filename)
+
+def read_source(filename, source_name, metrics=None):
+    # -> (normalized events, ok). Events read before an error are still kept.
+    events = []
+    if source_available(filename):
+        try:
+            for e in source_records(filename):
+                events.append(normalize_event(e, source_name, metrics))
+            print(f"✅ Processed {source_name}")
+        except Exception as err:
+            print(f"❌ Error in {filename}: {err}")
+            return events, False
+    return events, True
+
 def load_source(filename, source_name):
-    if os.path.exists(filename):
+    # Streams straight into dedup without keeping a copy of the feed
+    if source_available(filename):
         try:
-            with open(filename, "r", encoding='utf-8') as f:
-                data = json.load(f)
-                for e in data:
-                    iso_date = parse_event_date(e['date'], e.get('link', ''))
-                    style = SOURCE_COLORS.get(source_name, {'bg': '#3788d8', 'text': 'white'})
-                    event_obj = {
-                        "title": e['title'],
-                        "start": iso_date,
-                        "allDay": True,
-                        "url": e.get('link', '#'),
-                        "color": style['bg'],
-                        "textColor": style['text'],
-                        "extendedProps": {
-                            "source": source_name,
-                            "categories": get_categories(e['title'], source_name)
-                        }
-                    }
-                    add_event_smart(event_obj)
+            started = time.perf_counter()
+            for e in source_records(filename):
+                add_event_smart(normalize_event(e, source_name))
+            add_time(f"load:{source_name}", time.perf_counter() - started)
             print(f"✅ Processed {source_name}")
         except Exception as err:
             print(f"❌ Error in {filename}: {err}")
 
+# --- PART 5: INCREMENTAL BUILD CACHE ---
+SOURCES = [
+    ("lvhs_data.json", "LVHS"),
+    ("chamber_data.json", "Lander Chamber"),
+    ("cwc_data.json", "CWC"),
+    ("windriver_data.json", "WRVC"),
+    ("county10_data.json", "County 10")
+]
+CACHE_DIR = ".build_cache"
+MANIFEST_FILE = os.path.join(CACHE_DIR, "manifest.json")
+CACHE_VERSION = 1
+
+def source_hash(filename):
+    # Store snapshots are hashed together with the window they're read through
+    snapshot = stored_snapshot(filename)
+    if snapshot is not None:
+        return f"store:{snapshot}:{store_window[0]}:{store_window[1]}"
+    return hash_file(filename)
+
+def hash_file(filename):
+    if not os.path.exists(filename): return None
+    h = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def taxonomy_key():
+    # Anything that changes how an event is normalized, tagged or merged
+    # invalidates the whole cache, including any edit to this file's code.
+    config = {
+        "version": CACHE_VERSION,
+        "code": hash_file(os.path.abspath(__file__)),
+        "weights": CATEGORY_WEIGHTS,
+        "festival": FESTIVAL_KEYWORDS,
+        "rank": SOURCE_RANK,
+        "colors": SOURCE_COLORS,
+        "year": reference_now.year
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE): return None
+    try:
+        with open(MANIFEST_FILE, "r", encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as err:
+        print(f"⚠️ Ignoring unreadable build cache: {err}")
+        return None
+    if manifest.get("key") != taxonomy_key():
+        print("♻️ Build code, taxonomy or ranking changed, rebuilding everything.")
+        return None
+    return manifest
+
+def save_manifest(manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w", encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, MANIFEST_FILE)
+
+def clone_event(e):
+    # add_event_smart mutates the stored event, so cached copies stay pristine
+    return dict(e, extendedProps=dict(e["extendedProps"]))
+
+def ingest_source(filename, source_name):
+    # Runs in a worker when --workers > 1, so everything comes back in the result
+    started = time.perf_counter()
+    before = date_fallbacks.get(source_name, 0)
+    metrics = new_metrics()
+    events, ok = read_source(filename, source_name, metrics)
+    return {
+        "events": events,
+        "ok": ok,
+        "fallbacks": date_fallbacks.get(source_name, 0) - before,
+        "seconds": time.perf_counter() - started,
+        "metrics": metrics
+    }
+
+def init_worker(now, store_path, window):
+    set_reference_now(now)
+    set_event_store(store_path, window)
+
+def ingest_sources(jobs, workers=1, pool="process"):
+    # -> {source_name: result}; the merge order is decided by the caller, not by
+    # whichever worker finishes first.
+    if workers <= 1 or len(jobs) <= 1:
+        return {source_name: ingest_source(filename, source_name) for filename, source_name in jobs}
+    if pool == "thread":
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(reference_now, event_store_path, store_window))
+    with executor:
+        futures = {source_name: executor.submit(ingest_source, filename, source_name) for filename, source_name in jobs}
+        return {source_name: future.result() for source_name, future in futures.items()}
+
+def build_events(manifest=None, workers=1, pool="process"):
+    today = reference_now.strftime("%Y-%m-%d")
+    cached_sources = manifest["sources"] if manifest else {}
+    cached_dates = manifest["dates"] if manifest else {}
+    new_manifest = {"key": taxonomy_key(), "sources": {}, "dates": {}}
+    dirty_dates = set()
+    per_source = []
+
+    hashes = dict()
+    jobs = []
+    for filename, source_name in SOURCES:
+        hashes[source_name] = source_hash(filename)
+        cached = cached_sources.get(source_name)
+        # Sources that fell back to "today" are only reusable on the same day
+        reusable = cached and cached["file"] == filename and cached["hash"] == hashes[source_name] \
+            and (not cached["fallbacks"] or cached["today"] == today)
+        if not reusable:
+            jobs.append((filename, source_name))
+
+    started = time.perf_counter()
+    results = ingest_sources(jobs, workers, pool)
+    add_time("ingest", time.perf_counter() - started)
+    if results:
+        for source_name, result in results.items():
+            print(f"⏱️ {source_name}: {result['seconds']:.3f}s ({len(result['events'])} events)")
+            add_time(f"load:{source_name}", result["seconds"])
+            merge_metrics(result["metrics"])
+        print(f"⏱️ Ingested {len(results)} sources in {time.perf_counter() - started:.3f}s (workers={max(workers, 1)})")
+
+    for filename, source_name in SOURCES:
+        cached = cached_sources.get(source_name)
+        if source_name not in results:
+            events = cached["events"]
+            if cached["fallbacks"]:
+                date_fallbacks[source_name] = cached["fallbacks"]
+            print(f"♻️ Reused {source_name} (unchanged)")
+            count("sources_reused")
+        else:
+            result = results[source_name]
+            events = result["events"]
+            if result["fallbacks"]:
+                date_fallbacks[source_name] = result["fallbacks"]
+            dirty_dates.update(e["start"] for e in events)
+            if cached:
+                dirty_dates.update(e["start"] for e in cached["events"])
+            cached = {"file": filename, "hash": hashes[source_name], "today": today,
+                      "fallbacks": result["fallbacks"], "events": events} if result["ok"] else None
+        if cached:
+            new_manifest["sources"][source_name] = cached
+        per_source.append(events)
+
+    # Date order must match a full build: first appearance in source order
+    by_date = dict()
+    for events in per_source:
+        for e in events:
+            by_date.setdefault(e["start"], []).append(e)
+
+    reset_events()
+    final_list = []
+    with timed("dedup"):
+        for date_key, day_events in by_date.items():
+            if date_key in dirty_dates or date_key not in cached_dates:
+                for e in day_events:
+                    add_event_smart(clone_event(e))
+                count("dates_deduped")
+            else:
+                stored_events[date_key] = [clone_event(e) for e in cached_dates[date_key]]
+                count("dates_reused")
+            new_manifest["dates"][date_key] = [clone_event(e) for e in stored_events[date_key]]
+            final_list.extend(stored_events[date_key])
+    return final_list, new_manifest
+
+# Detail-page metadata collected by enrich_events.py, keyed by event URL
+METADATA_FILE = "event_metadata.json"
+ENRICHED_FIELDS = ("image", "startTime", "endTime", "venue", "address")
+
+def load_metadata():
+    if not os.path.exists(METADATA_FILE):
+        return {}
+    with open(METADATA_FILE, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    return {url: entry["fields"] for url, entry in cache.items() if entry.get("fields")}
+
+def merge_metadata(events, metadata):
+    merged = 0
+    for e in events:
+        fields = metadata.get(e["url"])
+        if fields:
+            e["extendedProps"].update({k: fields[k] for k in ENRICHED_FIELDS if k in fields})
+            merged += 1
+    if metadata:
+        print(f"🖼️ Merged detail-page metadata into {merged} events")
+
+def enriched_props(e):
+    return {k: e["extendedProps"][k] for k in ENRICHED_FIELDS if k in e["extendedProps"]}
+
+# --- RECURRING SERIES ---
+# Weekly and monthly repeats (story times, support groups, board meetings)
+# go to the page once, as a FullCalendar recurrence rule, instead of one row
+# per occurrence. Dates the rule skips become exdates; occurrences that
+# don't fit any rule stay single events.
+SERIES_MIN_OCCURRENCES = 4
+SERIES_MAX_MISSING = 0.25
+SERIES_MAX_GAP_DAYS = {"weekly": 35, "monthly": 70}  # a longer break starts a new series
+
+def split_runs(days, max_gap):
+    runs = [[days[0]]]
+    for d in days[1:]:
+        if (d - runs[-1][-1]).days > max_gap:
+            runs.append([d])
+        else:
+            runs[-1].append(d)
+    return runs
+
+def month_day(year, month, rule):
+    # The date `rule` ("setpos", weekday, n) / ("monthday", day) picks in a month, or None
+    try:
+        if rule[0] == "monthday":
+            return datetime(year, month, rule[1]).date()
+        first = datetime(year, month, 1).date()
+        d = first + timedelta(days=(rule[1] - first.weekday()) % 7 + 7 * (rule[2] - 1))
+        return d if d.month == month else None
+    except ValueError:
+        return None
+
+def expected_days(run, freq, rule):
+    if freq == "weekly":
+        return [run[0] + timedelta(days=i) for i in range((run[-1] - run[0]).days + 1)
+                if (run[0] + timedelta(days=i)).weekday() in rule]
+    out = []
+    year, month = run[0].year, run[0].month
+    while (year, month) <= (run[-1].year, run[-1].month):
+        d = month_day(year, month, rule)
+        if d and run[0] <= d <= run[-1]:
+            out.append(d)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return out
+
+def weekly_rule(days):
+    counts = dict()
+    for d in days:
+        counts[d.weekday()] = counts.get(d.weekday(), 0) + 1
+    return frozenset(wd for wd, n in counts.items() if n >= SERIES_MIN_OCCURRENCES)
+
+def monthly_rule(days):
+    # Most common of "nth weekday" and "day of month"; ties go to the weekday form
+    counts = dict()
+    for d in days:
+        for rule in (("setpos", d.weekday(), (d.day - 1) // 7 + 1), ("monthday", d.day)):
+            counts[rule] = counts.get(rule, 0) + 1
+    return max(counts, key=lambda r: (counts[r], r[0] == "setpos")) if counts else None
+
+def fit_series(days, freq, rule):
+    # -> [(run, exdates)] for every stretch of `days` the rule covers
+    if not rule:
+        return []
+    fits = [d for d in days if (d.weekday() in rule if freq == "weekly" else month_day(d.year, d.month, rule) == d)]
+    found = []
+    for run in split_runs(fits, SERIES_MAX_GAP_DAYS[freq]) if fits else []:
+        if len(run) < SERIES_MIN_OCCURRENCES:
+            continue
+        expected = expected_days(run, freq, rule)
+        missing = sorted(set(expected) - set(run))
+        if len(missing) <= SERIES_MAX_MISSING * len(expected):
+            found.append((run, missing))
+    return found
+
+def detect_series(events):
+    """Split deduplicated events into (singles, series).
+
+    Events group by source, normalized title and everything shown for them
+    (title text, categories); per-occurrence links and metadata are kept.
+    """
+    groups = dict()
+    for e in events:
+        key = (e["extendedProps"]["source"], clean_title(e["title"]), e["title"], tuple(e["extendedProps"]["categories"]))
+        groups.setdefault(key, []).append(e)
+
+    series = []
+    in_series = set()
+    for group in groups.values():
+        if len(group) < SERIES_MIN_OCCURRENCES:
+            continue
+        by_day = dict()
+        for e in group:
+            by_day.setdefault(datetime.strptime(e["start"], "%Y-%m-%d").date(), e)
+        days = sorted(by_day)
+        for freq, pick in (("weekly", weekly_rule), ("monthly", monthly_rule)):
+            rule = pick(days)
+            for run, missing in fit_series(days, freq, rule):
+                occurrences = [by_day[d] for d in run]
+                series.append({"freq": freq, "rule": rule, "start": run[0].isoformat(), "until": run[-1].isoformat(),
+                               "exdates": [d.isoformat() for d in missing], "events": occurrences})
+                in_series.update(id(e) for e in occurrences)
+                taken = set(run)
+                days = [d for d in days if d not in taken]
+            if len(days) < SERIES_MIN_OCCURRENCES:
+                break
+
+    series.sort(key=lambda s: (s["start"], s["events"][0]["title"], s["events"][0]["extendedProps"]["source"]))
+    singles = [e for e in events if id(e) not in in_series]
+    return singles, series
+
+def encode_series(series, source_ids, category_bits):
+    # One row per series. The link is a "{date}" template when the feed puts the
+    # date in it; links and metadata that still differ go in "per" by date.
+    rows = []
+    for s in series:
+        first = s["events"][0]
+        mask = 0
+        for cat in first["extendedProps"]["categories"]:
+            mask |= category_bits[cat]
+        url = first["url"].replace(first["start"], "{date}")
+        shared = dict()
+        for k in ENRICHED_FIELDS:
+            values = [e["extendedProps"].get(k) for e in s["events"]]
+            if values[0] is not None and values.count(values[0]) == len(values):
+                shared[k] = values[0]
+        per = dict()
+        for e in s["events"]:
+            extra = {k: v for k, v in enriched_props(e).items() if k not in shared}
+            if e["url"] != url.replace("{date}", e["start"]):
+                extra["url"] = e["url"]
+            if extra:
+                per[e["start"]] = extra
+        row = {"title": first["title"], "url": url, "source": source_ids[first["extendedProps"]["source"]], "cats": mask,
+               "freq": s["freq"], "start": s["start"], "until": s["until"]}
+        if s["freq"] == "weekly":
+            row["days"] = [(wd + 1) % 7 for wd in sorted(s["rule"])]  # FullCalendar counts from Sunday
+        elif s["rule"][0] == "setpos":
+            row["days"] = [(s["rule"][1] + 1) % 7]
+            row["setpos"] = s["rule"][2]
+        else:
+            row["monthday"] = s["rule"][1]
+        if s["exdates"]:
+            row["exdates"] = s["exdates"]
+        if shared:
+            row["meta"] = shared
+        if per:
+            row["per"] = per
+        rows.append(row)
+    return rows
+
+def fc_event(e, source_colors):
+    return {
+        "title": e["title"],
+        "start": e["start"],
+        "url": e["url"],
+        "color": source_colors.get(e["extendedProps"]["source"], "#95a5a6"),
+        "textColor": "black" if e["extendedProps"]["source"] == "LVHS" else "white",
+        "extendedProps": dict({
+            "source": e["extendedProps"]["source"],
+            "categories": e["extendedProps"]["categories"]
+        }, **enriched_props(e))
+    }
+
+SHARD_DIR = "events"
+SHARD_INDEX_FILE = os.path.join(SHARD_DIR, "index.json")
+
+def build_dictionaries(events, source_colors):
+    # Shared lookup tables for the compact payload; they ride along in the shard index
+    sources = sorted(SOURCE_RANK.keys())
+    categories = sorted(CATEGORY_WEIGHTS.keys())
+    for e in events:
+        if e["extendedProps"]["source"] not in sources:
+            sources.append(e["extendedProps"]["source"])
+        for cat in e["extendedProps"]["categories"]:
+            if cat not in categories:
+                categories.append(cat)
+    source_table = [[src, source_colors.get(src, "#95a5a6"), "black" if src == "LVHS" else "white"] for src in sources]
+    return source_table, categories
+
+def encode_compact(events, source_ids, category_bits, base):
+    # Columnar shard: parallel arrays, dates as day offsets from the index's
+    # base date, sources as dictionary ids, categories as a bitmask.
+    # Enriched metadata is sparse, so it's a row -> fields map, only when present.
+    columns = {"day": [], "title": [], "url": [], "source": [], "cats": []}
+    meta = dict()
+    for i, e in enumerate(events):
+        mask = 0
+        for cat in e["extendedProps"]["categories"]:
+            mask |= category_bits[cat]
+        columns["day"].append((datetime.strptime(e["start"], "%Y-%m-%d") - base).days)
+        columns["title"].append(e["title"])
+        columns["url"].append(e["url"])
+        columns["source"].append(source_ids[e["extendedProps"]["source"]])
+        columns["cats"].append(mask)
+        extra = enriched_props(e)
+        if extra:
+            meta[i] = extra
+    if meta:
+        columns["meta"] = meta
+    return columns
+
+SEARCH_INDEX_FILE = os.path.join(SHARD_DIR, "search.json")
+SEARCH_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+def encode_bitset(ids, total):
+    bits = bytearray((total + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+def build_search_index(events):
+    # Token -> posting list of global event ids (position in shard order),
+    # plus one bitset per source and category. The page intersects these
+    # instead of re-scanning every title on each keystroke.
+    postings = dict()
+    by_source = dict()
+    by_category = dict()
+    for gid, e in enumerate(events):
+        for token in set(SEARCH_TOKEN_RE.findall(e["title"].lower())):
+            postings.setdefault(token, []).append(gid)
+        by_source.setdefault(e["extendedProps"]["source"], []).append(gid)
+        for cat in e["extendedProps"]["categories"]:
+            by_category.setdefault(cat, []).append(gid)
+
+    tokens = sorted(postings)
+    delta_postings = []
+    for token in tokens:
+        # Ids are ascending, so store gaps to keep the file small
+        ids = postings[token]
+        delta_postings.append([ids[0]] + [b - a for a, b in zip(ids, ids[1:])])
+    return {
+        "tokens": tokens,
+        "postings": delta_postings,
+        "sources": {src: encode_bitset(ids, len(events)) for src, ids in sorted(by_source.items())},
+        "categories": {cat: encode_bitset(ids, len(events)) for cat, ids in sorted(by_category.items())}
+    }
+
+def write_event_shards(events, source_colors, series=()):
+    # One JSON file per month plus a small index; the page only fetches the
+    # months it is showing. Hashes let the browser cache shards across deploys.
+    # Recurring series ride along in the index and take the ids after the shards.
+    by_month = dict()
+    for e in events:
+        by_month.setdefault(e["start"][:7], []).append(e)
+
+    representatives = [s["events"][0] for s in series]
+    source_table, categories = build_dictionaries(events + representatives, source_colors)
+    source_ids = {row[0]: i for i, row in enumerate(source_table)}
+    category_bits = {cat: 1 << i for i, cat in enumerate(categories)}
+    base_str = min(by_month) + "-01" if by_month else reference_now.strftime("%Y-%m-01")
+    base = datetime.strptime(base_str, "%Y-%m-%d")
+
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    shards = dict()
+    ordered = []
+    for month in sorted(by_month):
+        columns = encode_compact(by_month[month], source_ids, category_bits, base)
+        content = json.dumps(columns, ensure_ascii=False, separators=(',', ':'))
+        filename = f"{month}.json"
+        with open(os.path.join(SHARD_DIR, filename), "w", encoding="utf-8") as f:
+            f.write(content)
+        shards[month] = {
+            "file": f"{SHARD_DIR}/{filename}",
+            "hash": hashlib.sha256(content.encode("utf-8")).hexdigest()[:12],
+            "offset": len(ordered),
+            "count": len(by_month[month])
+        }
+        ordered.extend(by_month[month])
 
-def generate_html(events):
-    fc_events = []
+    # Drop shards for months that no longer have events
+    for filename in os.listdir(SHARD_DIR):
+        if re.fullmatch(r'\d{4}-\d{2}\.json', filename) and filename[:7] not in shards:
+            os.remove(os.path.join(SHARD_DIR, filename))
+
+    search_content = json.dumps(build_search_index(ordered + representatives), ensure_ascii=False, separators=(',', ':'))
+    with open(SEARCH_INDEX_FILE, "w", encoding="utf-8") as f:
+        f.write(search_content)
+    search_meta = {"file": SEARCH_INDEX_FILE.replace(os.sep, "/"), "hash": hashlib.sha256(search_content.encode("utf-8")).hexdigest()[:12]}
+
+    shard_index = {"base": base_str, "total": len(ordered) + len(series), "sources": source_table, "categories": categories,
+                   "search": search_meta, "shards": shards}
+    if series:
+        shard_index["series"] = encode_series(series, source_ids, category_bits)
+    with open(SHARD_INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump(shard_index, f, indent=2)
+    return shard_index
+
+def generate_html(events, series=()):
     categories_list = sorted(list(CATEGORY_WEIGHTS.keys()))
     sources_list = sorted(list(SOURCE_RANK.keys()))
 
@@ -204,18 +1035,12 @@ def generate_html(events):
         "County 10": "#e91e63"
     }
 
-    for e in events:
-        fc_events.append({
-            "title": e["title"],
-            "start": e["start"],
-            "url": e["url"],
-            "color": source_colors.get(e["extendedProps"]["source"], "#95a5a6"),
-            "textColor": "black" if e["extendedProps"]["source"] == "LVHS" else "white",
-            "extendedProps": {
-                "source": e["extendedProps"]["source"],
-                "categories": e["extendedProps"]["categories"]
-            }
-        })
+    with timed("write_shards"):
+        shard_index = write_event_shards(events, source_colors, series)
+    # Exceptions and monthly patterns need FullCalendar's rrule plugin
+    needs_rrule = any(row["freq"] == "monthly" or "exdates" in row for row in shard_index.get("series", ()))
+    rrule_scripts = "<script src='https://cdn.jsdelivr.net/npm/rrule@2.6.4/dist/es5/rrule.min.js'></script>\n    " if needs_rrule else ""
+    rrule_plugin = "\n    <script src='https://cdn.jsdelivr.net/npm/@fullcalendar/rrule@6.1.10/index.global.min.js'></script>" if needs_rrule else ""
     
     # Generate Pill HTML without literal \n
     cat_pills = " ".join([f'<button class="filter-btn" data-type="category" data-value="{cat}">{cat}</button>' for cat in categories_list])
@@ -235,7 +1060,7 @@ def generate_html(events):
     <meta charset='utf-8' />
     <meta name="viewport" content="width=device-width, initial-scale=1">
     <title>Lander Community Calendar</title>
-    <script src='https://cdn.jsdelivr.net/npm/fullcalendar@6.1.10/index.global.min.js'></script>
+    {rrule_scripts}<script src='https://cdn.jsdelivr.net/npm/fullcalendar@6.1.10/index.global.min.js'></script>{rrule_plugin}
     <script src="https://cdn.tailwindcss.com"></script>
     <style>
       html, body {{ margin: 0; padding: 0; min-height: 100%; background-color: #f8f9fa; }}
@@ -318,8 +1143,12 @@ def generate_html(events):
         <div id='calendar'></div>
     </div>
 
-    <script>
-        var masterEventsList = {json.dumps(fc_events)};
+    <script id="shard-index">
+        // Month shards are fetched on demand; the index is inlined to save a round trip
+        var shardIndex = {json.dumps(shard_index)};
+    </script>
+    <script id="app">
+        var shardCache = {{}};
         var currentFilters = {{ category: 'all', sources: ['all'], search: '' }};
         var calendar; // Global calendar instance
 
@@ -348,6 +1177,202 @@ def generate_html(events):
             }});
         }}
 
+        var baseMs = Date.parse(shardIndex.base + 'T00:00:00Z');
+
+        function decodeCats(mask) {{
+            var cats = [];
+            for (var b = 0; b < shardIndex.categories.length; b++) {{
+                if (mask & (1 << b)) cats.push(shardIndex.categories[b]);
+            }}
+            return cats;
+        }}
+
+        function decodeShard(data, offset) {{
+            // Expand the columnar shard into FullCalendar event objects, once per shard
+            var events = new Array(data.title.length);
+            var meta = data.meta || {{}};
+            for (var i = 0; i < events.length; i++) {{
+                var src = shardIndex.sources[data.source[i]];
+                var cats = decodeCats(data.cats[i]);
+                events[i] = {{
+                    title: data.title[i],
+                    start: new Date(baseMs + data.day[i] * 86400000).toISOString().slice(0, 10),
+                    url: data.url[i],
+                    color: src[1],
+                    textColor: src[2],
+                    extendedProps: Object.assign({{ source: src[0], categories: cats, gid: offset + i }}, meta[i])
+                }};
+            }}
+            return events;
+        }}
+
+        var rruleDays = ['su', 'mo', 'tu', 'we', 'th', 'fr', 'sa'];
+        var seriesRows = shardIndex.series || [];
+        var seriesOffset = shardIndex.total - seriesRows.length;
+
+        function decodeSeries(row, i) {{
+            // One FullCalendar recurring event per series; FullCalendar expands it per view
+            var src = shardIndex.sources[row.source];
+            var event = {{
+                title: row.title,
+                url: row.url,
+                color: src[1],
+                textColor: src[2],
+                extendedProps: Object.assign({{ source: src[0], categories: decodeCats(row.cats), gid: seriesOffset + i, per: row.per || null }}, row.meta)
+            }};
+            if (row.freq === 'weekly' && !row.exdates) {{
+                event.daysOfWeek = row.days;
+                event.startRecur = row.start;
+                event.endRecur = new Date(Date.parse(row.until + 'T00:00:00Z') + 86400000).toISOString().slice(0, 10);
+            }} else {{
+                var rule = {{ freq: row.freq, dtstart: row.start, until: row.until }};
+                if (row.days) rule.byweekday = row.days.map(d => rruleDays[d]);
+                if (row.setpos) rule.bysetpos = row.setpos;
+                if (row.monthday) rule.bymonthday = row.monthday;
+                event.rrule = rule;
+                event.exdate = row.exdates || [];
+            }}
+            return event;
+        }}
+
+        var seriesEvents = seriesRows.map(decodeSeries);
+
+        function isoDay(d) {{
+            return monthKey(d) + '-' + String(d.getDate()).padStart(2, '0');
+        }}
+
+        function seriesIn(start, end) {{
+            var from = isoDay(start), to = isoDay(end);
+            return seriesEvents.filter((e, i) => seriesRows[i].start < to && seriesRows[i].until >= from);
+        }}
+
+        function occurrence(event) {{
+            // Link and metadata of one occurrence; series keep per-date values in "per"
+            var props = event.extendedProps;
+            var day = event.startStr.slice(0, 10);
+            var own = (props.per && props.per[day]) || {{}};
+            return {{ url: own.url || event.url.replace('{{date}}', day), venue: own.venue || props.venue }};
+        }}
+
+        function loadShard(month) {{
+            if (!shardCache[month]) {{
+                var meta = shardIndex.shards[month];
+                if (!meta) return Promise.resolve([]);
+                shardCache[month] = fetch(meta.file + '?v=' + meta.hash)
+                    .then(r => {{ if (!r.ok) throw new Error('Failed to load ' + meta.file); return r.json(); }})
+                    .then(data => decodeShard(data, meta.offset))
+                    .catch(err => {{ delete shardCache[month]; throw err; }});
+            }}
+            return shardCache[month];
+        }}
+
+        function monthKey(d) {{
+            return d.getFullYear() + '-' + String(d.getMonth() + 1).padStart(2, '0');
+        }}
+
+        function loadEvents(start, end) {{
+            var months = [];
+            var cursor = new Date(start.getFullYear(), start.getMonth(), 1);
+            var last = new Date(end.getTime() - 1);
+            while (cursor <= last) {{
+                months.push(monthKey(cursor));
+                cursor.setMonth(cursor.getMonth() + 1);
+            }}
+            return Promise.all(months.map(loadShard)).then(lists => [].concat.apply([], lists).concat(seriesIn(start, end)));
+        }}
+
+        var filterIndex = null;
+
+        function decodeBitset(b64) {{
+            var raw = atob(b64);
+            var bits = new Uint8Array(raw.length);
+            for (var i = 0; i < raw.length; i++) bits[i] = raw.charCodeAt(i);
+            return bits;
+        }}
+
+        function loadFilterIndex() {{
+            // Search postings and source/category bitsets, fetched the first time a filter is used
+            if (!filterIndex) {{
+                var meta = shardIndex.search;
+                filterIndex = fetch(meta.file + '?v=' + meta.hash)
+                    .then(r => {{ if (!r.ok) throw new Error('Failed to load ' + meta.file); return r.json(); }})
+                    .then(function(data) {{
+                        data.postings.forEach(function(list) {{
+                            for (var i = 1; i < list.length; i++) list[i] += list[i - 1];
+                        }});
+                        var decode = obj => {{ var out = {{}}; Object.keys(obj).forEach(k => {{ out[k] = decodeBitset(obj[k]); }}); return out; }};
+                        data.sources = decode(data.sources);
+                        data.categories = decode(data.categories);
+                        return data;
+                    }})
+                    .catch(err => {{ filterIndex = null; throw err; }});
+            }}
+            return filterIndex;
+        }}
+
+        function hasBit(bits, id) {{
+            return !!bits && (bits[id >> 3] & (1 << (id & 7))) !== 0;
+        }}
+
+        function passesFacets(idx, id) {{
+            if (!currentFilters.sources.includes('all')) {{
+                if (!currentFilters.sources.some(src => hasBit(idx.sources[src], id))) return false;
+            }}
+            if (currentFilters.category !== 'all' && !hasBit(idx.categories[currentFilters.category], id)) return false;
+            return true;
+        }}
+
+        function searchIds(idx, query) {{
+            // Every query term must prefix-match a title token; returns sorted ids or null for "no search"
+            var terms = query.toLowerCase().match(/[a-z0-9]+/g);
+            if (!terms) return null;
+            var hits = new Uint16Array(shardIndex.total);
+            var matched = [];
+            terms.forEach(function(term, t) {{
+                var lo = 0, hi = idx.tokens.length;
+                while (lo < hi) {{
+                    var mid = (lo + hi) >> 1;
+                    if (idx.tokens[mid] < term) lo = mid + 1; else hi = mid;
+                }}
+                for (var i = lo; i < idx.tokens.length && idx.tokens[i].lastIndexOf(term, 0) === 0; i++) {{
+                    var list = idx.postings[i];
+                    for (var j = 0; j < list.length; j++) {{
+                        var id = list[j];
+                        if (hits[id] !== t) continue;
+                        hits[id] = t + 1;
+                        if (t + 1 === terms.length) matched.push(id);
+                    }}
+                }}
+            }});
+            return matched.sort((a, b) => a - b);
+        }}
+
+        function loadIds(ids) {{
+            // Universal Search: only fetch the months that actually contain a hit
+            var months = Object.keys(shardIndex.shards);
+            var inSeries = ids.filter(id => id >= seriesOffset).map(id => seriesEvents[id - seriesOffset]);
+            ids = ids.filter(id => id < seriesOffset);
+            var wanted = months.filter(function(month) {{
+                var meta = shardIndex.shards[month];
+                return ids.some(id => id >= meta.offset && id < meta.offset + meta.count);
+            }});
+            return Promise.all(wanted.map(loadShard)).then(function(lists) {{
+                var byId = {{}};
+                lists.forEach(list => list.forEach(e => {{ byId[e.extendedProps.gid] = e; }}));
+                return ids.map(id => byId[id]).concat(inSeries);
+            }});
+        }}
+
+        function filteredEvents(start, end) {{
+            var filtering = currentFilters.search || currentFilters.category !== 'all' || !currentFilters.sources.includes('all');
+            if (!filtering) return loadEvents(start, end);
+            return loadFilterIndex().then(function(idx) {{
+                var ids = currentFilters.search ? searchIds(idx, currentFilters.search) : null;
+                if (ids) return loadIds(ids.filter(id => passesFacets(idx, id)));
+                return loadEvents(start, end).then(list => list.filter(e => passesFacets(idx, e.extendedProps.gid)));
+            }});
+        }}
+
         function sendHeight() {{
             const wrapper = document.getElementById('main-wrapper');
             if (wrapper) {{
@@ -388,27 +1413,21 @@ def generate_html(events):
                 height: 'auto',
                 handleWindowResize: true,
                 events: function(info, successCallback, failureCallback) {{
-                    var filtered = masterEventsList.filter(function(e) {{
-                        if (currentFilters.search) {{
-                            var term = currentFilters.search.toLowerCase();
-                            if (!e.title.toLowerCase().includes(term)) return false;
-                        }}
-                        
-                        if (!currentFilters.sources.includes('all')) {{
-                            if (!currentFilters.sources.includes(e.extendedProps.source)) return false;
-                        }}
-
-                        if (currentFilters.category !== 'all' && !e.extendedProps.categories.includes(currentFilters.category)) return false;
-                        return true;
-                    }});
-                    successCallback(filtered);
+                    filteredEvents(info.start, info.end).then(successCallback).catch(failureCallback);
                 }},
                 eventClick: function(info) {{
                     info.jsEvent.preventDefault();
-                    if (info.event.url) window.open(info.event.url);
+                    if (info.event.url) window.open(occurrence(info.event).url);
                 }},
                 eventDidMount: function(info) {{
-                    info.el.title = info.event.title + " (" + info.event.extendedProps.source + ")";
+                    var own = occurrence(info.event);
+                    var venue = own.venue;
+                    if (own.url !== info.event.url) {{
+                        // Recurring event: point the link at this occurrence's page
+                        var link = info.el.tagName === 'A' ? info.el : info.el.querySelector('a[href]');
+                        if (link) link.href = own.url;
+                    }}
+                    info.el.title = info.event.title + (venue ? " @ " + venue : "") + " (" + info.event.extendedProps.source + ")";
                     if (info.view.type.includes('list')) {{
                         // Support list view items - REPLACE "all-day" with tags
                         var timeEl = info.el.querySelector('.fc-list-event-time');
@@ -479,9 +1498,14 @@ def generate_html(events):
                 }});
             }});
 
+            var searchTimer = null;
             document.getElementById('search-input').addEventListener('input', function(e) {{
-                currentFilters.search = e.target.value;
-                calendar.refetchEvents();
+                // Debounce so fast typing only refetches once the user pauses
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(function() {{
+                    currentFilters.search = e.target.value;
+                    calendar.refetchEvents();
+                }}, 200);
             }});
 
             document.getElementById('resetFilters').addEventListener('click', function() {{
@@ -504,15 +1528,121 @@ def generate_html(events):
     with open("index.html", "w", encoding="utf-8") as f:
         f.write(html_content)
 
-def main():
-    load_source("lvhs_data.json", "LVHS")
-    load_source("chamber_data.json", "Lander Chamber")
-    load_source("cwc_data.json", "CWC")
-    load_source("windriver_data.json", "WRVC")
-    load_source("county10_data.json", "County 10")
-    final_list = [e for dl in stored_events.values() for e in dl]
+def report_date_fallbacks():
+    if date_fallbacks:
+        detail = ", ".join(f"{src}: {n}" for src, n in sorted(date_fallbacks.items()))
+        print(f"⚠️ {sum(date_fallbacks.values())} dates could not be parsed and fell back to today ({detail})")
+
+def category_counts(events):
+    counts = dict()
+    for e in events:
+        for cat in e["extendedProps"]["categories"]:
+            counts[cat] = counts.get(cat, 0) + 1
+    return counts
+
+def write_metrics(events, seconds, mode, workers):
+    report = dict(build_metrics)
+    report.update({
+        "generated": reference_now.isoformat(timespec="seconds"),
+        "mode": mode,
+        "workers": workers,
+        "total_seconds": round(seconds, 4),
+        "events": len(events),
+        "events_by_source": dict(),
+        "date_fallbacks": dict(date_fallbacks),
+        "categories": category_counts(events),
+        "stages": {k: round(v, 4) for k, v in build_metrics["stages"].items()}
+    })
+    for e in events:
+        source = e["extendedProps"]["source"]
+        report["events_by_source"][source] = report["events_by_source"].get(source, 0) + 1
+    tmp = METRICS_FILE + ".tmp"
+    with open(tmp, "w", encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    os.replace(tmp, METRICS_FILE)
+    counters = build_metrics["counters"]
+    print(f"📈 Metrics written to {METRICS_FILE}: {seconds:.3f}s total, "
+          f"{counters.get('sequence_matcher_calls', 0)} SequenceMatcher calls, "
+          f"{sum(build_metrics['merges'].values())} merges")
+
+def report_profile(profiler, filename, top=20):
+    profiler.dump_stats(filename)
+    print(f"🔬 Profile written to {filename} (top {top} by cumulative time):")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+
+def memory_report(top=10):
+    current, peak = tracemalloc.get_traced_memory()
+    stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+    print(f"🧠 Peak traced memory: {peak / 1e6:.1f} MB (current {current / 1e6:.1f} MB)")
+    return {
+        "peak_bytes": peak,
+        "current_bytes": current,
+        "top": [{"where": str(s.traceback[0]), "bytes": s.size, "blocks": s.count} for s in stats]
+    }
+
+def run_build(args):
+    if args.stream:
+        reset_events()
+        for filename, source_name in SOURCES:
+            load_source(filename, source_name)
+        final_list = [e for dl in stored_events.values() for e in dl]
+    else:
+        manifest = None if args.full else load_manifest()
+        final_list, new_manifest = build_events(manifest, args.workers, args.pool)
+        save_manifest(new_manifest)
+    report_date_fallbacks()
+    with timed("merge_metadata"):
+        merge_metadata(final_list, load_metadata())
     print(f"Total Unique Events: {len(final_list)}")
-    generate_html(final_list)
+    singles, series = final_list, []
+    if not args.no_series:
+        with timed("series"):
+            singles, series = detect_series(final_list)
+        count("series", len(series))
+        count("series_occurrences", len(final_list) - len(singles))
+        print(f"🔁 {len(series)} recurring series cover {len(final_list) - len(singles)} occurrences")
+    with timed("generate_html"):
+        generate_html(singles, series)
+    return final_list
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Lander community calendar page.")
+    parser.add_argument("--full", action="store_true", help="ignore the build cache and reprocess every source")
+    parser.add_argument("--workers", type=int, default=1, help="read, parse and tag sources in parallel with this many workers")
+    parser.add_argument("--pool", choices=["process", "thread"], default="process", help="worker pool type used with --workers")
+    parser.add_argument("--stream", action="store_true", help="bounded-memory mode: stream each source straight into dedup (no cache, no workers)")
+    parser.add_argument("--store", nargs="?", const=event_store.STORE_FILE, help="read feeds from the SQLite event store (default events.db)")
+    parser.add_argument("--since", help="with --store: only events on or after this YYYY-MM-DD")
+    parser.add_argument("--until", help="with --store: only events on or before this YYYY-MM-DD")
+    parser.add_argument("--no-series", action="store_true", help="send every occurrence as its own event instead of detecting recurring series")
+    parser.add_argument("--profile", nargs="?", const="build_profile.prof", help="run under cProfile and save the stats here (process workers are not profiled)")
+    parser.add_argument("--trace-memory", action="store_true", help="trace allocations with tracemalloc and add the peak to the metrics")
+    args = parser.parse_args(argv)
+
+    set_reference_now()
+    reset_metrics()
+    if args.store and os.path.exists(args.store):
+        set_event_store(args.store, (args.since, args.until))
+    elif args.store:
+        print(f"⚠️ Event store {args.store} not found, reading the JSON files.")
+
+    profiler = cProfile.Profile() if args.profile else None
+    if args.trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    final_list = run_build(args)
+    if profiler:
+        profiler.disable()
+    seconds = time.perf_counter() - started
+    if args.trace_memory:
+        build_metrics["memory"] = memory_report()
+        tracemalloc.stop()
+    if profiler:
+        report_profile(profiler, args.profile)
+    mode = "stream" if args.stream else ("full" if args.full else "incremental")
+    write_metrics(final_list, seconds, mode, max(args.workers, 1))
 
 if __name__ == "__main__":
     main()
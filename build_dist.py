@@ -0,0 +1,191 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+# Production output: python build_dist.py (after build_calendar.py)
+# Copies the page and its event shards into dist/, moves the inline CSS and
+# app JS into minified, content-hashed files that can be cached forever,
+# writes .gz siblings and prints a size report. The sizes are kept in the
+# build cache (restored in CI), not dist/, so the report can compare runs and
+# the file isn't published.
+
+SOURCE_HTML = "index.html"
+SHARD_DIR = "events"
+DIST_DIR = "dist"
+ASSET_DIR = "assets"
+SIZES_FILE = os.path.join(".build_cache", "dist_sizes.json")
+COMPRESS_EXTENSIONS = (".html", ".js", ".css", ".json")
+
+
+def strip_comments(code, line_comments=True):
+    # Removes /* */ (and // for JS) comments outside of string literals.
+    # Regex literals in the app never contain "//" or "/*", so they pass through.
+    out = []
+    i, n = 0, len(code)
+    quote = None
+    while i < n:
+        ch = code[i]
+        if quote:
+            out.append(ch)
+            if ch == '\\' and i + 1 < n:
+                out.append(code[i + 1])
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+            i += 1
+        elif ch in '"\'`':
+            quote = ch
+            out.append(ch)
+            i += 1
+        elif code.startswith('/*', i):
+            end = code.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif line_comments and code.startswith('//', i):
+            end = code.find('\n', i)
+            i = n if end == -1 else end
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def minify_css(css):
+    css = strip_comments(css, line_comments=False)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js):
+    # Conservative: drop comments, indentation and blank lines but keep line
+    # breaks so automatic semicolon insertion behaves exactly as before.
+    js = strip_comments(js)
+    lines = [line.strip() for line in js.split('\n')]
+    return "\n".join(line for line in lines if line)
+
+
+def minify_html(html):
+    lines = [line.strip() for line in html.split('\n')]
+    return "\n".join(line for line in lines if line)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:10]
+
+
+def write_text(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_asset(name, ext, text):
+    # -> URL relative to the page
+    rel = f"{ASSET_DIR}/{name}.{content_hash(text)}{ext}"
+    write_text(os.path.join(DIST_DIR, rel), text)
+    return rel
+
+
+def build_page(html):
+    style = re.search(r'<style>(.*?)</style>', html, re.S)
+    css_url = write_asset("calendar", ".css", minify_css(style.group(1)))
+    html = html.replace(style.group(0), f'<link rel="stylesheet" href="{css_url}">')
+
+    app = re.search(r'<script id="app">(.*?)</script>', html, re.S)
+    js_url = write_asset("calendar", ".js", minify_js(app.group(1)))
+    html = html.replace(app.group(0), f'<script src="{js_url}"></script>')
+
+    # The shard index changes with every data refresh, so it stays inline
+    data = re.search(r'<script id="shard-index">(.*?)</script>', html, re.S)
+    html = html.replace(data.group(0), '<script id="shard-index">' + minify_js(data.group(1)) + '</script>')
+    write_text(os.path.join(DIST_DIR, "index.html"), minify_html(html))
+
+
+def copy_shards():
+    if not os.path.isdir(SHARD_DIR): return
+    for filename in sorted(os.listdir(SHARD_DIR)):
+        if filename.endswith(".json"):
+            shutil.copyfile(os.path.join(SHARD_DIR, filename), os.path.join(DIST_DIR, SHARD_DIR, filename))
+
+
+def compress_all():
+    # mtime=0 keeps the .gz bytes stable between identical builds
+    for root, _, files in os.walk(DIST_DIR):
+        for filename in files:
+            if filename.endswith(COMPRESS_EXTENSIONS):
+                path = os.path.join(root, filename)
+                with open(path, "rb") as f:
+                    data = f.read()
+                with open(path + ".gz", "wb") as f:
+                    f.write(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def collect_sizes():
+    sizes = dict()
+    for root, _, files in os.walk(DIST_DIR):
+        for filename in files:
+            if filename.endswith(COMPRESS_EXTENSIONS):
+                path = os.path.join(root, filename)
+                rel = os.path.relpath(path, DIST_DIR).replace(os.sep, "/")
+                gz = path + ".gz"
+                sizes[rel] = {"raw": os.path.getsize(path), "gzip": os.path.getsize(gz) if os.path.exists(gz) else None}
+    return sizes
+
+
+def size_key(rel):
+    # Hashed asset names change every build; compare them by their stable prefix
+    return re.sub(r'\.[0-9a-f]{10}(\.\w+)$', r'\1', rel)
+
+
+def print_size_report(sizes, previous):
+    before = {size_key(rel): s for rel, s in previous.items()}
+    print("📦 dist/ size report")
+    print(f"   {'file':<36} {'raw':>10} {'gzip':>10}  change (gzip)")
+    total_raw = total_gz = 0
+    for rel in sorted(sizes):
+        s = sizes[rel]
+        total_raw += s["raw"]
+        total_gz += s["gzip"] or 0
+        old = before.get(size_key(rel))
+        change = ""
+        if old and old.get("gzip") is not None and s["gzip"] is not None:
+            delta = s["gzip"] - old["gzip"]
+            change = f"{delta:+d} B" if delta else "="
+        elif previous:
+            change = "new"
+        print(f"   {rel:<36} {s['raw']:>10,} {s['gzip'] or 0:>10,}  {change}")
+    print(f"   {'TOTAL':<36} {total_raw:>10,} {total_gz:>10,}")
+
+
+def main():
+    if not os.path.exists(SOURCE_HTML):
+        print(f"❌ {SOURCE_HTML} not found, run build_calendar.py first.")
+        sys.exit(1)
+
+    previous = dict()
+    if os.path.exists(SIZES_FILE):
+        with open(SIZES_FILE, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.makedirs(os.path.join(DIST_DIR, SHARD_DIR), exist_ok=True)
+
+    with open(SOURCE_HTML, "r", encoding="utf-8") as f:
+        build_page(f.read())
+    copy_shards()
+    compress_all()
+
+    sizes = collect_sizes()
+    print_size_report(sizes, previous)
+    os.makedirs(os.path.dirname(SIZES_FILE), exist_ok=True)
+    with open(SIZES_FILE, "w", encoding="utf-8") as f:
+        json.dump(sizes, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from playwright.async_api import async_playwright
+
+import scrape_county10
+from browser_profile import apply_profile, report_blocking
+
+# Detail-page enrichment. Visits each event's own page (a few at a time) and
+# pulls og:/JSON-LD metadata: image, start/end times, venue and address.
+# Results live in event_metadata.json keyed by URL, together with a hash of
+# the listing (title + date) they were fetched for, so a daily run only opens
+# pages for events that are new or whose listing changed. The build merges
+# these fields into each event's extendedProps.
+
+METADATA_FILE = "event_metadata.json"
+CONCURRENCY = 4
+MAX_NEW_PER_RUN = 300
+RETRY_FAILED_DAYS = 7
+# Bumped when extraction changes; older entries are fetched again
+CACHE_VERSION = 2
+PAGE_TIMEOUT = 30000
+
+# Shared by READY_JS and EXTRACT_JS. A page only counts as the event's own
+# once it has an Event JSON-LD node, or og:url / og:title naming this event:
+# County 10 serves the site-wide WebPage JSON-LD and og:image before
+# CitySpark fills in the event.
+PAGE_JS = """
+    const meta = name => {
+        const el = document.querySelector(`meta[property="${name}"], meta[name="${name}"]`);
+        return el ? el.getAttribute('content') : null;
+    };
+    const nodes = [];
+    const walk = node => {
+        if (Array.isArray(node)) return node.forEach(walk);
+        if (!node || typeof node !== 'object') return;
+        nodes.push(node);
+        if (node['@graph']) walk(node['@graph']);
+    };
+    document.querySelectorAll('script[type="application/ld+json"]').forEach(s => {
+        try { walk(JSON.parse(s.textContent)); } catch (e) {}
+    });
+    const isEvent = n => [].concat(n['@type'] || []).some(t => /Event$/.test(t));
+    const ev = nodes.find(isEvent);
+    const same = (a, b) => !!a && !!b && a.trim().replace(/\\/$/, '').toLowerCase() === b.trim().replace(/\\/$/, '').toLowerCase();
+    const ownPage = same(meta('og:url'), location.href) || same(meta('og:title'), title);
+"""
+
+READY_JS = "title => {" + PAGE_JS + "    return !!ev || ownPage;\n}"
+
+EXTRACT_JS = "title => {" + PAGE_JS + """    if (!ev && !ownPage) return null;
+    const event = ev || {};
+    const place = [].concat(event.location || [])[0] || {};
+    let address = place.address || null;
+    if (address && typeof address === 'object') {
+        address = [address.streetAddress, address.addressLocality, address.addressRegion].filter(Boolean).join(', ');
+    }
+    let image = [].concat(event.image || [])[0] || meta('og:image');
+    if (image && typeof image === 'object') image = image.url || null;
+    return {
+        image: image || null,
+        startTime: event.startDate && event.startDate.includes('T') ? event.startDate : null,
+        endTime: event.endDate && event.endDate.includes('T') ? event.endDate : null,
+        venue: (typeof place === 'string' ? place : place.name) || null,
+        address: address || null
+    };
+}"""
+
+
+def listing_hash(event):
+    return hashlib.sha256(f"{event['title']}|{event['date']}".encode("utf-8")).hexdigest()[:12]
+
+
+def load_cache():
+    if not os.path.exists(METADATA_FILE):
+        return {}
+    with open(METADATA_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cache(cache):
+    tmp = METADATA_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, METADATA_FILE)
+
+
+def detail_pages():
+    # url -> listing record, for links that point at exactly one event
+    by_url = {}
+    shared = set()
+    for filename in sorted(glob.glob("*_data.json")):
+        with open(filename, "r", encoding="utf-8") as f:
+            for e in json.load(f):
+                link = e.get("link") or ""
+                if not link.startswith("http"):
+                    continue
+                if link in by_url and by_url[link]["title"] != e["title"]:
+                    shared.add(link)  # e.g. LVHS points every game at one calendar page
+                by_url.setdefault(link, e)
+    return {url: e for url, e in by_url.items() if url not in shared}
+
+
+def needs_fetch(entry, event, today):
+    if not entry or entry["hash"] != listing_hash(event) or entry.get("version") != CACHE_VERSION:
+        return True
+    if not entry["fields"]:
+        return entry["checked"] <= (today - timedelta(days=RETRY_FAILED_DAYS)).strftime("%Y-%m-%d")
+    return False
+
+
+async def fetch_metadata(context, semaphore, url, title):
+    # -> event-level fields, or {} when the page never showed this event
+    async with semaphore:
+        page = await context.new_page()
+        try:
+            await page.goto(url, timeout=PAGE_TIMEOUT, wait_until="domcontentloaded")
+            try:
+                # County 10 detail pages are filled in by JS after load
+                await page.wait_for_function(READY_JS, arg=title, timeout=8000)
+            except Exception:
+                pass
+            fields = await page.evaluate(EXTRACT_JS, title)
+            if fields is None:
+                print(f"   ⚠️ {url}: no event metadata on the page, will retry.")
+                return {}
+            return {k: v for k, v in fields.items() if v}
+        except Exception as e:
+            print(f"   ⚠️ {url}: {e}")
+            return {}
+        finally:
+            await page.close()
+
+
+async def enrich_events(concurrency=CONCURRENCY, max_new=MAX_NEW_PER_RUN):
+    today = datetime.now()
+    cache = load_cache()
+    pages = detail_pages()
+    # Forget events that dropped out of every feed
+    cache = {url: entry for url, entry in cache.items() if url in pages}
+    todo = [url for url, e in pages.items() if needs_fetch(cache.get(url), e, today)]
+    print(f"🔎 {len(pages)} detail pages, {len(pages) - len(todo)} cached, {len(todo)} to fetch (max {max_new} this run).")
+    todo = todo[:max_new]
+
+    if todo:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True, args=scrape_county10.LAUNCH_ARGS)
+            context = await browser.new_context(**scrape_county10.CONTEXT_OPTIONS)
+            await apply_profile(context, "Enrichment")
+            semaphore = asyncio.Semaphore(concurrency)
+            results = await asyncio.gather(*[fetch_metadata(context, semaphore, url, pages[url]["title"]) for url in todo])
+            await browser.close()
+        report_blocking("Enrichment")
+        for url, fields in zip(todo, results):
+            # Empty fields mark a failure, retried after RETRY_FAILED_DAYS
+            cache[url] = {"hash": listing_hash(pages[url]), "fields": fields, "checked": today.strftime("%Y-%m-%d"),
+                          "version": CACHE_VERSION}
+
+    save_cache(cache)
+    enriched = sum(1 for entry in cache.values() if entry["fields"])
+    print(f"🎉 Metadata cached for {enriched} events.")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(enrich_events())
+    except Exception as err:
+        print(f"❌ Enrichment failed: {err}, keeping the existing metadata.")
+    sys.exit(0)  # Enrichment is optional; never block the build
@@ -0,0 +1,287 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Local SQLite store for scraped events. Every scrape upserts its feed: rows
+# are keyed by a stable fingerprint (plus an occurrence number for exact
+# repeats, so exports round-trip them), keep their first/last-seen timestamps and
+# their position in the feed, and the feed's current snapshot is whatever was
+# seen in its latest run. The build can query a date window straight from
+# here; the *_data.json files are still exported for anything that reads them.
+#
+# Exports are canonical: events sorted by day/date/title/link, each with a
+# stable "id", keys sorted, and files only replaced (atomically) when their
+# content changed. Each save also writes deltas/<feed>.json listing what was
+# added, removed or changed since the previous snapshot, keyed by id.
+#
+# Usage: python event_store.py [import|export|stats|prune DAYS]
+
+STORE_FILE = "events.db"
+DELTA_DIR = "deltas"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    fingerprint TEXT PRIMARY KEY,
+    feed TEXT NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date TEXT NOT NULL,
+    day TEXT,
+    link TEXT,
+    position INTEGER NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_day ON events(day);
+CREATE INDEX IF NOT EXISTS idx_events_feed ON events(feed, last_seen, position);
+CREATE INDEX IF NOT EXISTS idx_events_link ON events(link);
+CREATE TABLE IF NOT EXISTS feeds (
+    feed TEXT PRIMARY KEY,
+    last_run TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    snapshot TEXT NOT NULL
+);
+"""
+
+UPSERT_SQL = """
+INSERT INTO events (fingerprint, feed, source, title, date, day, link, position, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(fingerprint) DO UPDATE SET position = excluded.position, last_seen = excluded.last_seen
+"""
+
+
+def connect(path=STORE_FILE):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def fingerprint(feed, e, occurrence=0):
+    # `occurrence` numbers exact repeats within one scrape, so a feed that
+    # lists the same record twice keeps both rows; the first keeps the old key
+    key = "\x1f".join([feed, e["title"], e["date"], e.get("link") or ""])
+    if occurrence:
+        key += f"\x1f{occurrence}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprints(feed, events):
+    seen = dict()
+    for e in events:
+        key = fingerprint(feed, e)
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        yield fingerprint(feed, e, n) if n else key
+
+
+def record_day(date_str):
+    # Indexed calendar day when the feed sends an ISO date; NULL otherwise
+    head = date_str[:10]
+    if len(head) == 10 and head[4] == '-' and head[7] == '-' and head.replace('-', '').isdigit():
+        return head
+    return None
+
+
+def canonical_key(e):
+    return (record_day(e["date"]) or "", e["date"], e["title"], e.get("link") or "")
+
+
+# Feeds whose link is one calendar page for every event; only the title tells
+# their events apart
+SHARED_LINK_SOURCES = {"LVHS"}
+
+
+def short_hash(*parts):
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def with_ids(events):
+    """Canonically ordered copies of `events`, each with a stable id.
+
+    The id comes from identity fields only: source + link for per-event links,
+    plus the date when the link repeats (recurring events), plus the title for
+    shared-link feeds (SHARED_LINK_SOURCES) and events without a link. So a
+    retitled or rescheduled event keeps its id and shows up as "changed" in
+    the delta.
+    """
+    events = sorted(events, key=canonical_key)
+    link_counts = dict()
+    for e in events:
+        key = (e["source"], e.get("link") or "")
+        link_counts[key] = link_counts.get(key, 0) + 1
+    records = []
+    seen = dict()
+    for e in events:
+        link = e.get("link") or ""
+        if not link or e["source"] in SHARED_LINK_SOURCES:
+            event_id = short_hash(e["source"], link, e["date"], e["title"])
+        elif link_counts[(e["source"], link)] > 1:
+            event_id = short_hash(e["source"], link, e["date"])
+        else:
+            event_id = short_hash(e["source"], link)
+        # Repeats of the same identity are numbered in canonical order
+        n = seen.get(event_id, 0)
+        seen[event_id] = n + 1
+        records.append(dict(e, id=event_id if n == 0 else f"{event_id}-{n}"))
+    return records
+
+
+def snapshot_hash(events):
+    return hashlib.sha256(json.dumps(sorted(events, key=canonical_key), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def write_if_changed(filename, content):
+    # Atomic replace, skipped when the file already holds exactly this content
+    if os.path.exists(filename):
+        with open(filename, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    tmp = filename + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, filename)
+    return True
+
+
+def upsert_events(feed, events, path=STORE_FILE, seen_at=None):
+    """Record one scrape of `feed`. -> number of events not seen before."""
+    seen_at = seen_at or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    rows = [(key, feed, e["source"], e["title"], e["date"], record_day(e["date"]), e.get("link"), i, seen_at, seen_at)
+            for i, (key, e) in enumerate(zip(fingerprints(feed, events), events))]
+    conn = connect(path)
+    try:
+        with conn:
+            known = {r[0] for r in conn.execute("SELECT fingerprint FROM events WHERE feed = ?", (feed,))}
+            conn.executemany(UPSERT_SQL, rows)
+            conn.execute("INSERT INTO feeds (feed, last_run, count, snapshot) VALUES (?, ?, ?, ?) "
+                         "ON CONFLICT(feed) DO UPDATE SET last_run = excluded.last_run, count = excluded.count, "
+                         "snapshot = excluded.snapshot", (feed, seen_at, len(events), snapshot_hash(events)))
+    finally:
+        conn.close()
+    return len({r[0] for r in rows} - known)
+
+
+def feed_snapshot(feed, path=STORE_FILE):
+    # Hash of the feed's current events, or None if it was never stored
+    if not os.path.exists(path):
+        return None
+    conn = connect(path)
+    try:
+        row = conn.execute("SELECT snapshot FROM feeds WHERE feed = ?", (feed,)).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def query_events(feed, start=None, end=None, path=STORE_FILE):
+    """The feed's current events in canonical order, optionally limited to days in [start, end].
+
+    Rows whose date text isn't ISO have no indexed day and are always returned.
+    """
+    sql = ("SELECT e.source, e.title, e.date, e.link FROM events e JOIN feeds f "
+           "ON f.feed = e.feed AND e.last_seen = f.last_run WHERE e.feed = ?")
+    params = [feed]
+    if start:
+        sql += " AND (e.day IS NULL OR e.day >= ?)"
+        params.append(start)
+    if end:
+        sql += " AND (e.day IS NULL OR e.day <= ?)"
+        params.append(end)
+    conn = connect(path)
+    try:
+        # Same order as canonical_key (BINARY collation compares like Python strings)
+        order = " ORDER BY COALESCE(e.day, ''), e.date, e.title, COALESCE(e.link, '')"
+        for source, title, date, link in conn.execute(sql + order, params):
+            yield {"source": source, "title": title, "date": date, "link": link}
+    finally:
+        conn.close()
+
+
+def export_json(feed, path=STORE_FILE, filename=None):
+    """Write the feed's snapshot as canonical *_data.json. -> True if the file changed."""
+    content = json.dumps(with_ids(query_events(feed, path=path)), indent=2, sort_keys=True) + "\n"
+    return write_if_changed(filename or feed, content)
+
+
+def previous_snapshot(feed, path=STORE_FILE):
+    # Last stored snapshot, or the committed JSON on a store's first run
+    if feed_snapshot(feed, path) is not None:
+        return with_ids(query_events(feed, path=path))
+    if os.path.exists(feed):
+        with open(feed, "r", encoding="utf-8") as f:
+            return with_ids({k: v for k, v in e.items() if k != "id"} for e in json.load(f))
+    return []
+
+
+def compute_delta(old, new):
+    old_by_id = {e["id"]: e for e in old}
+    new_by_id = {e["id"]: e for e in new}
+    return {
+        "added": [e for e in new if e["id"] not in old_by_id],
+        "removed": [e["id"] for e in old if e["id"] not in new_by_id],
+        "changed": [e for e in new if e["id"] in old_by_id and old_by_id[e["id"]] != e]
+    }
+
+
+def write_delta(feed, old, new):
+    delta = dict(compute_delta(old, new), feed=feed, base=snapshot_hash(old), snapshot=snapshot_hash(new))
+    os.makedirs(DELTA_DIR, exist_ok=True)
+    write_if_changed(os.path.join(DELTA_DIR, feed.replace("_data.json", "") + ".json"),
+                     json.dumps(delta, indent=2, sort_keys=True) + "\n")
+    return delta
+
+
+def save_feed(feed, events, path=STORE_FILE):
+    # What the scrapers call instead of dumping their JSON directly
+    old = previous_snapshot(feed, path)
+    upsert_events(feed, events, path)
+    delta = write_delta(feed, old, with_ids(query_events(feed, path=path)))
+    changed = export_json(feed, path)
+    print(f"🗄️ {feed}: {len(events)} events stored (+{len(delta['added'])} -{len(delta['removed'])} "
+          f"~{len(delta['changed'])}){'' if changed else ', JSON export unchanged'}.")
+
+
+def prune(days, path=STORE_FILE):
+    # Drop events that haven't been in their feed's snapshot for `days` days
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
+    conn = connect(path)
+    try:
+        with conn:
+            removed = conn.execute("DELETE FROM events WHERE last_seen < ? AND last_seen NOT IN "
+                                   "(SELECT last_run FROM feeds WHERE feeds.feed = events.feed)", (cutoff,)).rowcount
+    finally:
+        conn.close()
+    return removed
+
+
+def data_files():
+    return sorted(f for f in os.listdir(".") if f.endswith("_data.json"))
+
+
+def main(argv):
+    command = argv[0] if argv else "stats"
+    if command == "import":
+        # One-off migration: seed the store from the committed JSON files
+        for filename in data_files():
+            with open(filename, "r", encoding="utf-8") as f:
+                events = json.load(f)
+            print(f"📥 {filename}: {len(events)} events ({upsert_events(filename, events)} new)")
+    elif command == "export":
+        for filename in data_files():
+            if feed_snapshot(filename):
+                print(f"📤 {filename}: {'updated' if export_json(filename) else 'unchanged'}")
+    elif command == "prune":
+        print(f"🧹 Removed {prune(int(argv[1]) if len(argv) > 1 else 90)} stale events.")
+    else:
+        conn = connect()
+        for feed, last_run, count in conn.execute("SELECT feed, last_run, count FROM feeds ORDER BY feed"):
+            total = conn.execute("SELECT COUNT(*) FROM events WHERE feed = ?", (feed,)).fetchone()[0]
+            print(f"   {feed:<22} {count:>5} current / {total:>5} stored  (last run {last_run})")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
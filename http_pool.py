@@ -0,0 +1,127 @@
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit, urlencode
+
+# Small stdlib JSON client shared by the browserless scrapers. A pool is a
+# plain dict: each thread keeps one keep-alive connection per host, and every
+# connection is remembered so close_pool() can shut them all. 429 and 5xx
+# responses are retried with exponential backoff (or the server's Retry-After).
+
+TIMEOUT = 20
+RETRIES = 3
+BACKOFF = 1.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+USER_AGENT = "Mozilla/5.0 (compatible; LanderCommunityCalendar/1.0)"
+
+# Record/replay hooks for benchmark_scrapers.py: RECORDER (a list) collects
+# every exchange; HOST_MAP sends a host (or "*" for any) to a replay server.
+# Playwright's context.request calls skip the browser's HAR routing, so the
+# scrapers make them through api_request() to get the same treatment.
+RECORDER = None
+HOST_MAP = {}
+RECORD_LOCK = threading.Lock()
+
+
+def new_pool(timeout=TIMEOUT):
+    return {"local": threading.local(), "opened": [], "lock": threading.Lock(), "timeout": timeout, "retries": 0}
+
+
+def close_pool(pool):
+    with pool["lock"]:
+        for conn in pool["opened"]:
+            conn.close()
+        pool["opened"].clear()
+
+
+def connection(pool, scheme, netloc):
+    conns = getattr(pool["local"], "conns", None)
+    if conns is None:
+        conns = pool["local"].conns = {}
+    conn = conns.get(netloc)
+    if conn is None:
+        replay = HOST_MAP.get(netloc) or HOST_MAP.get("*")
+        scheme, target = urlsplit(replay)[:2] if replay else (scheme, netloc)
+        conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conns[netloc] = conn_class(target, timeout=pool["timeout"])
+        with pool["lock"]:
+            pool["opened"].append(conn)
+    return conn
+
+
+def send(conn, path, headers):
+    try:
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+    except (http.client.HTTPException, OSError):
+        # Server dropped the idle connection; reconnect once
+        conn.close()
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+    return response, response.read()
+
+
+def retry_delay(response, attempt, backoff):
+    after = response.getheader("Retry-After")
+    if after and after.isdigit():
+        return float(after)
+    return backoff * (2 ** attempt)
+
+
+def full_path(parts, params):
+    path = parts.path or "/"
+    query = "&".join(q for q in (parts.query, urlencode(params or {})) if q)
+    return path + "?" + query if query else path
+
+
+def record(host, method, path, data, status, headers, body):
+    if RECORDER is not None:
+        with RECORD_LOCK:
+            RECORDER.append({"host": host, "method": method, "path": path, "data": data or "", "status": status,
+                             "headers": headers, "body": body.decode("utf-8", "replace")})
+
+
+def request(pool, url, params=None, headers=None, retries=RETRIES, backoff=BACKOFF):
+    """GET `url` (+ `params`), retrying 429/5xx. -> (response, body)"""
+    parts = urlsplit(url)
+    path = full_path(parts, params)
+    headers = dict({"User-Agent": USER_AGENT, "Accept": "application/json", "Connection": "keep-alive"}, **(headers or {}))
+    conn = connection(pool, parts.scheme, parts.netloc)
+
+    for attempt in range(retries + 1):
+        response, body = send(conn, path, headers)
+        if response.status not in RETRY_STATUSES or attempt == retries:
+            break
+        delay = retry_delay(response, attempt, backoff)
+        print(f"   ⏳ HTTP {response.status} from {parts.netloc}, retrying in {delay:.1f}s...")
+        with pool["lock"]:
+            pool["retries"] += 1
+        time.sleep(delay)
+    record(parts.netloc, "GET", path, "", response.status, dict(response.getheaders()), body)
+    return response, body
+
+
+async def api_request(context, url, method="GET", params=None, headers=None, data=None):
+    """context.request.fetch() that is recorded and replayed like request(). -> APIResponse"""
+    parts = urlsplit(url)
+    path = full_path(parts, params)
+    replay = HOST_MAP.get(parts.netloc) or HOST_MAP.get("*")
+    target = (replay if replay else f"{parts.scheme}://{parts.netloc}") + path
+    response = await context.request.fetch(target, method=method, headers=headers, data=data)
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", "replace")
+    record(parts.netloc, method, path, data, response.status, response.headers, await response.body())
+    return response
+
+
+def check_status(response, url):
+    if response.status != 200:
+        raise http.client.HTTPException(f"HTTP {response.status} for {url}")
+
+
+def get_json(pool, url, params=None, headers=None, retries=RETRIES, backoff=BACKOFF):
+    """GET `url` (+ `params`) and decode the JSON body. Raises HTTPException on a bad status."""
+    response, body = request(pool, url, params, headers, retries, backoff)
+    check_status(response, url)
+    return json.loads(body)
@@ -0,0 +1,203 @@
+import json
+import re
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import http_pool
+
+# Capture mode for widgets that hydrate themselves from JSON (CitySpark on
+# County 10, GrowthZone on the Chamber). Instead of scrolling until every tile
+# is rendered, we keep the JSON the widget asked for on first load and then
+# replay that same request with its paging parameter advanced. Unless paging
+# was followed to its end, the scrapers also run the DOM loop and keep
+# whichever found more, so a partial capture never replaces a feed.
+
+TITLE_KEYS = ("Name", "name", "Title", "title", "EventName")
+DATE_KEYS = ("DateStart", "StartDate", "StartDateTime", "startDate", "start_date", "Start", "start")
+LINK_KEYS = ("Url", "url", "EventUrl", "DetailUrl", "Link", "link")
+ID_KEYS = ("PId", "EventId", "Id", "id")
+
+# Paging parameters: offsets advance by the page size, page numbers by one
+OFFSET_KEYS = ("skip", "Skip", "offset", "Offset")
+PAGE_KEYS = ("page", "Page", "pageNumber", "PageNumber", "pageIndex", "PageIndex")
+
+MS_DATE_RE = re.compile(r'/Date\((-?\d+)')
+LOCAL_TZ = ZoneInfo("America/Denver")  # what the widgets show
+SLUG_RE = re.compile(r'[^a-z0-9]+')
+MAX_PAGES = 40
+
+
+def start_capture(page, url_match):
+    """Collect every XHR/fetch response whose URL contains `url_match`."""
+    captured = []
+
+    def on_response(response):
+        if response.request.resource_type in ("xhr", "fetch") and url_match in response.url.lower():
+            captured.append(response)
+
+    page.on("response", on_response)
+    return captured
+
+
+def first_value(record, keys):
+    for key in keys:
+        if record.get(key) not in (None, ""):
+            return record[key]
+    return None
+
+
+def slugify(text):
+    return SLUG_RE.sub("-", text.lower()).strip("-")
+
+
+def record_time(value):
+    """Local time of an ISO string or a .NET "/Date(ms)/" value, else None."""
+    if not isinstance(value, str):
+        return None
+    match = MS_DATE_RE.match(value)
+    if match:
+        moment = datetime.fromtimestamp(int(match.group(1)) / 1000, tz=timezone.utc)
+        return moment.astimezone(LOCAL_TZ).replace(tzinfo=None)
+    try:
+        return datetime.fromisoformat(value[:19])
+    except ValueError:
+        return None
+
+
+def record_day(value):
+    moment = record_time(value)
+    return moment.date() if moment else None
+
+
+def find_records(payload):
+    """First list of event-like dicts anywhere in a JSON payload."""
+    if isinstance(payload, list):
+        if payload and all(isinstance(r, dict) for r in payload) \
+                and first_value(payload[0], TITLE_KEYS) and first_value(payload[0], DATE_KEYS):
+            return payload
+        items = payload
+    elif isinstance(payload, dict):
+        items = payload.values()
+    else:
+        return None
+    for item in items:
+        found = find_records(item)
+        if found is not None:
+            return found
+    return None
+
+
+def advance(key, value, count):
+    if key in OFFSET_KEYS:
+        return int(value) + count
+    if key in PAGE_KEYS:
+        return int(value) + 1
+    return None
+
+
+def next_page(url, body, count):
+    """The same request with its paging parameter moved on, or None."""
+    if isinstance(body, dict):
+        for key, value in body.items():
+            try:
+                new = advance(key, value, count)
+            except (TypeError, ValueError):
+                continue
+            if new is not None:
+                return url, dict(body, **{key: new})
+
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for i, (key, value) in enumerate(query):
+        try:
+            new = advance(key, value, count)
+        except (TypeError, ValueError):
+            continue
+        if new is not None:
+            query[i] = (key, str(new))
+            return urlunsplit(parts._replace(query=urlencode(query))), body
+    return None
+
+
+async def read_json(response):
+    try:
+        return await response.json()
+    except Exception:
+        return None
+
+
+async def capture_events(context, captured, to_event, horizon=None, label="capture"):
+    """-> (events, complete) from the captured responses plus further API pages.
+
+    `to_event` maps one JSON record to an event dict (or None). Paging stops
+    on an empty/repeated page, a failed request, or once a record starts
+    after `horizon`. `complete` is only True when the horizon or the end of
+    the data was reached; a paging parameter we can't find, a failed page or
+    the page cap leave it False.
+    """
+    events = {}
+    last_request = None
+    page_size = 0
+
+    def add(records):
+        added = 0
+        for record in records:
+            event = to_event(record)
+            key = event and (event["link"] or (event["title"], event["date"]))
+            if event and key not in events:
+                events[key] = event
+                added += 1
+        return added
+
+    def past_horizon(records):
+        days = [record_day(first_value(r, DATE_KEYS)) for r in records]
+        return horizon is not None and any(d and d > horizon for d in days)
+
+    reached = False
+    for response in list(captured):
+        records = find_records(await read_json(response)) or []
+        if records:
+            add(records)
+            last_request, page_size = response.request, len(records)
+            reached = reached or past_horizon(records)
+    if last_request is None:
+        return [], False
+
+    url = last_request.url
+    try:
+        body = last_request.post_data_json
+    except Exception:
+        body = None
+    headers = {k: v for k, v in last_request.headers.items() if k.lower() != "content-length"}
+
+    fetched = 0
+    complete = reached
+    while not reached and fetched < MAX_PAGES:
+        step = next_page(url, body, page_size)
+        if step is None:
+            print(f"   ⚠️ {label}: no paging parameter found in the captured request.")
+            break
+        url, body = step
+        data = json.dumps(body) if isinstance(body, dict) else last_request.post_data
+        try:
+            response = await http_pool.api_request(context, url, method=last_request.method, headers=headers, data=data)
+        except Exception as e:
+            print(f"   ⚠️ {label}: page request failed ({e}), keeping what we have.")
+            break
+        if not response.ok:
+            break
+        records = find_records(await read_json(response)) or []
+        if not records:
+            complete = True  # ran out of data
+            break
+        if not add(records):
+            break  # same page again: the parameter didn't page
+        fetched += 1
+        page_size = len(records)
+        reached = past_horizon(records)
+        complete = reached
+
+    print(f"📡 {label}: {len(events)} events from {len(captured)} captured + {fetched} fetched JSON pages"
+          f"{'' if complete else ' (incomplete)'}.")
+    return list(events.values()), complete
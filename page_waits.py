@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+# Shared replacement for the fixed sleeps in the scroll / pagination loops.
+# wait_for_update() returns as soon as something useful happens:
+#   - the card count passes `previous_count`           -> "grew"
+#   - the DOM changed and then stayed quiet for `settle` -> "settled"
+#   - nothing changed at all for `idle` seconds          -> "idle"
+#   - a matching XHR/fetch response arrived (then settle)
+# and never waits longer than `timeout`. Every call records how long it
+# actually waited against the fixed sleep it replaced (`replaces`).
+
+WAIT_JS = """([selector, previous, settleMs, idleMs, timeoutMs]) => new Promise(resolve => {
+    let changed = false;
+    let quietTimer = null;
+    let hardTimer = null;
+    let observer = null;
+    const count = () => selector ? document.querySelectorAll(selector).length : 0;
+    const done = reason => {
+        if (observer) observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve({ reason: reason, count: count() });
+    };
+    if (previous >= 0 && count() > previous) return done('grew');
+    observer = new MutationObserver(() => {
+        if (previous >= 0 && count() > previous) return done('grew');
+        changed = true;
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done('settled'), settleMs);
+    });
+    observer.observe(document.body, { childList: true, subtree: true });
+    if (idleMs > 0) quietTimer = setTimeout(() => { if (!changed) done('idle'); }, idleMs);
+    hardTimer = setTimeout(() => done('timeout'), timeoutMs);
+})"""
+
+WAIT_STATS = dict()
+
+
+def response_matches(response, response_match):
+    return response.request.resource_type in ("xhr", "fetch") and response_match in response.url
+
+
+async def wait_for_update(page, selector=None, previous_count=None, action=None, response_match=None,
+                          timeout=10.0, settle=0.3, idle=1.5, label="scrape", replaces=0.0):
+    """Run `action` (e.g. a click) and wait until the page has reacted to it.
+
+    `response_match` is a URL substring for the XHR that carries the data
+    ("" accepts any XHR/fetch); when given, the DOM wait only starts once that
+    response is in. Returns the reason the wait ended.
+    """
+    started = time.perf_counter()
+    response_task = None
+    if response_match is not None:
+        response_task = asyncio.ensure_future(page.wait_for_event(
+            "response", predicate=lambda r: response_matches(r, response_match), timeout=timeout * 1000))
+
+    if action:
+        try:
+            await action()
+        except Exception:
+            if response_task: response_task.cancel()
+            raise
+
+    reason = None
+    if response_task:
+        try:
+            await response_task
+            # The data is already here, only give the DOM a moment to render it
+            idle = settle
+        except Exception:
+            reason = "timeout"
+
+    if reason is None:
+        remaining = max(timeout - (time.perf_counter() - started), 0.1)
+        previous = -1 if previous_count is None else previous_count
+        try:
+            result = await page.evaluate(WAIT_JS, [selector, previous, settle * 1000, idle * 1000, remaining * 1000])
+            reason = result["reason"]
+        except Exception:
+            # A full navigation destroyed the document we were observing
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=remaining * 1000)
+                reason = "navigated"
+            except Exception:
+                reason = "timeout"
+
+    waited = time.perf_counter() - started
+    stats = WAIT_STATS.setdefault(label, {"waits": 0, "waited": 0.0, "fixed": 0.0})
+    stats["waits"] += 1
+    stats["waited"] += waited
+    stats["fixed"] += replaces
+    return reason
+
+
+def wait_savings(label):
+    stats = WAIT_STATS.get(label)
+    if not stats: return 0.0
+    return round(stats["fixed"] - stats["waited"], 2)
+
+
+def report_wait_savings(label):
+    stats = WAIT_STATS.get(label)
+    if not stats: return
+    print(f"⏱️ {label}: {stats['waits']} waits took {stats['waited']:.1f}s instead of "
+          f"{stats['fixed']:.1f}s of fixed sleeps (saved {wait_savings(label):.1f}s)")
@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from playwright.async_api import async_playwright
+
+from page_waits import wait_savings
+from browser_profile import blocked_requests
+import scrape_state
+import scrape_county10
+import scrape_windriver
+import scrape_chamber
+import scrape_cwc
+import scrape_lvhs
+
+# Runs every scraper against ONE shared Chromium. Each source gets its own
+# isolated browser context (County 10 keeps its stealth settings), sources run
+# concurrently up to --concurrency, and each one has its own timeout so a slow
+# or blocked site can't hold up the rest.
+
+SCRAPERS = [
+    ("County 10", scrape_county10),
+    ("WRVC", scrape_windriver),
+    ("Lander Chamber", scrape_chamber),
+    ("CWC", scrape_cwc),
+    ("LVHS", scrape_lvhs)
+]
+SUMMARY_FILE = "scrape_summary.json"
+
+async def run_source(browser, semaphore, name, module, timeout):
+    async with semaphore:
+        print(f"🚀 [{name}] starting...")
+        started = time.perf_counter()
+        summary = {"source": name, "status": "ok", "events": 0, "seconds": 0.0}
+        context = await browser.new_context(**module.CONTEXT_OPTIONS)
+        try:
+            events = await asyncio.wait_for(module.collect_events(context), timeout)
+            summary["events"] = len(events)
+            module.save_events(events)
+        except asyncio.TimeoutError:
+            summary["status"] = "timeout"
+            print(f"⏰ [{name}] gave up after {timeout}s, keeping existing data.")
+        except Exception as err:
+            summary["status"] = "error"
+            summary["error"] = str(err)
+            print(f"❌ [{name}] failed: {err}")
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        summary["seconds"] = round(time.perf_counter() - started, 2)
+        summary["wait_saved_seconds"] = wait_savings(module.SOURCE_NAME)
+        summary["blocked_requests"] = blocked_requests(module.SOURCE_NAME)
+        return summary
+
+def shared_launch_args(scrapers):
+    # Stealth flags are browser-wide, so the shared browser carries all of them
+    launch_args = []
+    for _, module in scrapers:
+        for arg in module.LAUNCH_ARGS:
+            if arg not in launch_args:
+                launch_args.append(arg)
+    return launch_args
+
+async def scrape_all(concurrency=3, timeout=600, only=None):
+    scrapers = [(name, module) for name, module in SCRAPERS if not only or name in only]
+    # A timed-out REST/API fetch is killed with its process instead of running on
+    scrape_state.ISOLATE_FETCHES = True
+
+    started = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=shared_launch_args(scrapers))
+        semaphore = asyncio.Semaphore(concurrency)
+        summaries = await asyncio.gather(*[run_source(browser, semaphore, name, module, timeout) for name, module in scrapers])
+        await browser.close()
+
+    total = round(time.perf_counter() - started, 2)
+    print("\n📋 Scrape summary")
+    for s in summaries:
+        print(f"   {s['source']:<15} {s['status']:<8} {s['events']:>5} events  {s['seconds']:>7.2f}s  (waits saved {s['wait_saved_seconds']:.1f}s, {s['blocked_requests']} requests blocked)")
+    print(f"   {'TOTAL':<15} {'':<8} {sum(s['events'] for s in summaries):>5} events  {total:>7.2f}s wall")
+
+    with open(SUMMARY_FILE, "w") as f:
+        json.dump({"wall_seconds": total, "sources": summaries}, f, indent=2)
+    return summaries
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run all calendar scrapers in one shared browser.")
+    parser.add_argument("--concurrency", type=int, default=3, help="how many sources scrape at the same time")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds before a single source is abandoned")
+    parser.add_argument("--only", action="append", help="limit to a source name (repeatable)")
+    parser.add_argument("--full", action="store_true", help="ignore saved scrape state and re-download every page")
+    args = parser.parse_args(argv)
+    scrape_state.FORCE_FULL = args.full
+    asyncio.run(scrape_all(args.concurrency, args.timeout, args.only))
+
+if __name__ == "__main__":
+    main()
+    sys.exit(0) # Always exit success so the build still runs with yesterday's data
@@ -1,102 +1,171 @@
 import asyncio
 from playwright.async_api import async_playwright
-import json
+import event_store
 from datetime import datetime, timedelta
+import scrape_state
 import re
 import sys
+from network_capture import start_capture, capture_events, first_value, record_day, slugify, TITLE_KEYS, DATE_KEYS, LINK_KEYS, ID_KEYS
+from page_waits import wait_for_update, report_wait_savings
+from browser_profile import apply_profile, report_blocking
 
-async def scrape_chamber_scroll():
-    async with async_playwright() as p:
-        # UPDATED: headless=True for Cloud Execution
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        print("🌐 Navigating to Lander Chamber (Infinite Scroll Mode)...")
-        await page.goto("https://info.landerchamber.org/events", timeout=60000)
-        
-        try:
-            await page.wait_for_selector(".gz-list-card-wrapper", timeout=15000)
-        except:
-            print("⚠️ Initial load timed out.")
+SOURCE_NAME = "Lander Chamber"
+OUTPUT_FILE = "chamber_data.json"
+LAUNCH_ARGS = []
+CONTEXT_OPTIONS = {}
+# Read the GrowthZone JSON directly instead of scrolling the cards. Off until
+# the endpoint and field names have been checked against a live capture.
+CAPTURE_MODE = False
+CAPTURE_MATCH = "/api/events"
 
-        target_date = datetime.now() + timedelta(days=365)
-        current_year = datetime.now().year
-        
-        print("⏬ Starting Scroll Sequence...")
-        
-        last_height = await page.evaluate("document.body.scrollHeight")
-        scroll_attempts = 0
-        max_scrolls = 30
+# One round trip for every card instead of 4-5 per card
+EXTRACT_JS = """cards => cards.map(card => {
+    const titleEl = card.querySelector('.gz-card-title a');
+    const dateEl = card.querySelector('.gz-card-date');
+    return {
+        title: titleEl ? titleEl.innerText : null,
+        link: titleEl ? titleEl.getAttribute('href') : null,
+        date: dateEl ? dateEl.innerText : null
+    };
+})"""
+
+LAST_DATE_JS = """() => {
+    const cards = document.querySelectorAll('.gz-list-card-wrapper');
+    const dateEl = cards.length ? cards[cards.length - 1].querySelector('.gz-card-date') : null;
+    return dateEl ? dateEl.innerText : null;
+}"""
+
+async def extract_cards(page):
+    cards = await page.locator(".gz-list-card-wrapper").evaluate_all(EXTRACT_JS)
+    events = []
+    for card in cards:
+        if card["title"] is not None:
+            events.append({
+                "source": SOURCE_NAME,
+                "title": card["title"].strip(),
+                "date": (card["date"] or "Check Website").strip(),
+                "link": card["link"]
+            })
+    return events
+
+def record_to_event(record):
+    # GrowthZone record -> same shape (and date text) as a scraped card
+    title = first_value(record, TITLE_KEYS)
+    start = first_value(record, DATE_KEYS)
+    day = record_day(start)
+    if not title or not day:
+        return None
+    link = first_value(record, LINK_KEYS) or ""
+    event_id = first_value(record, ID_KEYS)
+    if not link and event_id:
+        link = f"/events/details/{slugify(title)}-{event_id}"
+    if link.startswith("/"):
+        link = "https://info.landerchamber.org" + link
+    return {"source": SOURCE_NAME, "title": title.strip(), "date": f"{day:%A %b} {day.day}, {day.year}", "link": link}
+
+async def collect_events(context):
+    await apply_profile(context, SOURCE_NAME)
+    page = await context.new_page()
+    captured = start_capture(page, CAPTURE_MATCH)
+    
+    print("🌐 Navigating to Lander Chamber (Infinite Scroll Mode)...")
+    await page.goto("https://info.landerchamber.org/events", timeout=60000)
+    
+    try:
+        await page.wait_for_selector(".gz-list-card-wrapper", timeout=15000)
+    except:
+        print("⚠️ Initial load timed out.")
+
+    target_date = scrape_state.now() + timedelta(days=365)
+
+    events = None
+    captured_events = []
+    if CAPTURE_MODE:
+        captured_events, complete = await capture_events(context, captured, record_to_event, horizon=target_date.date(), label=SOURCE_NAME)
+        if complete:
+            events = captured_events
+        elif captured_events:
+            print("⚠️ GrowthZone paging not followed to the end, checking against the scroll loop.")
+        else:
+            print("⚠️ No GrowthZone JSON captured, falling back to scrolling.")
+
+    if events is None:
+        events = await scroll_events(page, target_date)
+        if len(captured_events) > len(events):
+            print(f"   Keeping the {len(captured_events)} captured events over {len(events)} scrolled.")
+            events = captured_events
+    report_wait_savings(SOURCE_NAME)
+    report_blocking(SOURCE_NAME)
+
+    await page.close()
+    return events
+
+async def scroll_events(page, target_date):
+    current_year = scrape_state.now().year
+    print("⏬ Starting Scroll Sequence...")
+    
+    last_height = await page.evaluate("document.body.scrollHeight")
+    scroll_attempts = 0
+    max_scrolls = 30
+    
+    while scroll_attempts < max_scrolls:
+        count = await page.locator(".gz-list-card-wrapper").count()
+        await wait_for_update(page, ".gz-list-card-wrapper", count,
+                              action=lambda: page.evaluate("window.scrollTo(0, document.body.scrollHeight)"),
+                              idle=3, timeout=6, label=SOURCE_NAME, replaces=3)
         
-        while scroll_attempts < max_scrolls:
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(3)
-            
-            cards = await page.query_selector_all(".gz-list-card-wrapper")
-            if cards:
-                last_card = cards[-1]
-                date_el = await last_card.query_selector(".gz-card-date")
-                if date_el:
-                    date_text = (await date_el.inner_text()).strip()
-                    try:
-                        clean_d = re.sub(r'^[A-Za-z]+,?\s*', '', date_text).split(' - ')[0]
-                        if ',' in clean_d:
-                            dt = datetime.strptime(clean_d, "%b %d, %Y")
-                        else:
-                            dt = datetime.strptime(f"{clean_d}, {current_year}", "%b %d, %Y")
-                        
-                        print(f"   ...Scrolled to event: {date_text}")
-                        if dt > target_date:
-                            print("✅ Reached 12-month horizon. Stopping.")
-                            break
-                    except:
-                        pass
-
-            new_height = await page.evaluate("document.body.scrollHeight")
-            if new_height == last_height:
-                print("   ...Page height didn't change. Checking for 'Load More' button just in case...")
-                try:
-                    load_btn = await page.query_selector("text='Load More'")
-                    if load_btn and await load_btn.is_visible():
-                        await load_btn.click()
-                        await asyncio.sleep(3)
-                        new_height = await page.evaluate("document.body.scrollHeight")
-                    else:
-                        print("   🛑 Reached absolute bottom.")
-                        break
-                except:
+        date_text = await page.evaluate(LAST_DATE_JS)
+        if date_text:
+            date_text = date_text.strip()
+            try:
+                clean_d = re.sub(r'^[A-Za-z]+,?\s*', '', date_text).split(' - ')[0]
+                if ',' in clean_d:
+                    dt = datetime.strptime(clean_d, "%b %d, %Y")
+                else:
+                    dt = datetime.strptime(f"{clean_d}, {current_year}", "%b %d, %Y")
+                
+                print(f"   ...Scrolled to event: {date_text}")
+                if dt > target_date:
+                    print("✅ Reached 12-month horizon. Stopping.")
                     break
-            
-            last_height = new_height
-            scroll_attempts += 1
+            except:
+                pass
 
-        print("👀 Collecting all loaded events...")
-        all_events = []
-        final_cards = await page.query_selector_all(".gz-list-card-wrapper")
+        new_height = await page.evaluate("document.body.scrollHeight")
+        if new_height == last_height:
+            print("   ...Page height didn't change. Checking for 'Load More' button just in case...")
+            try:
+                load_btn = await page.query_selector("text='Load More'")
+                if load_btn and await load_btn.is_visible():
+                    count = await page.locator(".gz-list-card-wrapper").count()
+                    await wait_for_update(page, ".gz-list-card-wrapper", count, action=load_btn.click,
+                                          idle=3, timeout=6, label=SOURCE_NAME, replaces=3)
+                    new_height = await page.evaluate("document.body.scrollHeight")
+                else:
+                    print("   🛑 Reached absolute bottom.")
+                    break
+            except:
+                break
         
-        for card in final_cards:
-            title_el = await card.query_selector(".gz-card-title a")
-            date_el = await card.query_selector(".gz-card-date")
-            
-            if title_el:
-                title = await title_el.inner_text()
-                link = await title_el.get_attribute("href")
-                date = await date_el.inner_text() if date_el else "Check Website"
-                
-                all_events.append({
-                    "source": "Lander Chamber",
-                    "title": title.strip(),
-                    "date": date.strip(),
-                    "link": link
-                })
+        last_height = new_height
+        scroll_attempts += 1
+
+    print("👀 Collecting all loaded events...")
+    all_events = await extract_cards(page)
+    return list({e['link']: e for e in all_events}.values())
 
+def save_events(events):
+    event_store.save_feed(OUTPUT_FILE, events)
+    print(f"🎉 Saved {len(events)} Chamber events.")
+
+async def scrape_chamber_scroll():
+    async with async_playwright() as p:
+        # UPDATED: headless=True for Cloud Execution
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(**CONTEXT_OPTIONS)
+        events = await collect_events(context)
         await browser.close()
-        
-        unique_events = {e['link']: e for e in all_events}.values()
-        
-        with open("chamber_data.json", "w") as f:
-            json.dump(list(unique_events), f, indent=2)
-        print(f"🎉 Saved {len(unique_events)} Chamber events.")
+        save_events(events)
 
 if __name__ == "__main__":
     asyncio.run(scrape_chamber_scroll())
@@ -1,120 +1,177 @@
 import asyncio
 from playwright.async_api import async_playwright
-import json
+import event_store
 import sys
+from datetime import timedelta
+import scrape_state
+from network_capture import start_capture, capture_events, first_value, record_time, slugify, TITLE_KEYS, DATE_KEYS, ID_KEYS
+from page_waits import wait_for_update, report_wait_savings
+from browser_profile import apply_profile, report_blocking
 
-async def scrape_county10_stealth():
-    async with async_playwright() as p:
-        # 1. Launch with "Stealth" flags to hide automation
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox',
-                '--disable-setuid-sandbox'
-            ]
-        )
+SOURCE_NAME = "County 10"
+OUTPUT_FILE = "county10_data.json"
+# Read the CitySpark JSON directly instead of scrolling the tiles. Off until
+# the endpoint and field names have been checked against a live capture.
+CAPTURE_MODE = False
+CAPTURE_MATCH = "cityspark"
+
+# "Stealth" flags to hide automation
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-setuid-sandbox'
+]
+
+# Mimic a real laptop screen and user agent
+CONTEXT_OPTIONS = {
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "viewport": {"width": 1366, "height": 768},
+    "locale": "en-US",
+    "timezone_id": "America/Denver"
+}
+
+# One round trip for every tile instead of 3-4 per tile
+EXTRACT_JS = """cards => cards.map(card => {
+    const titleEl = card.querySelector('.csOneLine');
+    const anchor = card.querySelector('a');
+    return {
+        date: card.getAttribute('data-date'),
+        title: titleEl ? titleEl.innerText : 'Unknown',
+        link: anchor ? anchor.getAttribute('href') : ''
+    };
+})"""
+
+async def extract_cards(page):
+    cards = await page.locator(".csEventTile").evaluate_all(EXTRACT_JS)
+    events = []
+    for card in cards:
+        link = card["link"] or ""
+        if link.startswith("#"):
+            link = "https://county10.com/events/" + link
+        if card["date"]:
+            events.append({
+                "source": SOURCE_NAME,
+                "title": card["title"].strip(),
+                "date": card["date"].split("T")[0],
+                "link": link
+            })
+    return events
+
+def record_to_event(record):
+    # CitySpark record -> same shape (and link) as a scraped tile
+    title = first_value(record, TITLE_KEYS)
+    start = record_time(first_value(record, DATE_KEYS))
+    if not title or not start:
+        return None
+    event_id = first_value(record, ID_KEYS)
+    link = f"https://county10.com/events/#/details/{slugify(title)}/{event_id}/{start:%Y-%m-%dT%H}" if event_id else ""
+    return {"source": SOURCE_NAME, "title": title.strip(), "date": start.date().isoformat(), "link": link}
+
+async def collect_events(context):
+    await apply_profile(context, SOURCE_NAME)
+    page = await context.new_page()
+    captured = start_capture(page, CAPTURE_MATCH)
+
+    print("🌐 Navigating to County 10...")
+    try:
+        await page.goto("https://county10.com/events/#/", timeout=60000, wait_until="domcontentloaded")
+    except Exception as e:
+        print(f"⚠️ Navigation timeout (might be slow loading): {e}")
+
+    # Soft Wait: Don't crash if it fails, just try to find the container first
+    print("⏳ Waiting for calendar widget...")
+    try:
+        # First look for the main CitySpark container
+        await page.wait_for_selector("#CitySpark", state="attached", timeout=20000)
+        print("   ...Widget container found.")
         
-        # 2. Mimic a real laptop screen and user agent
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            viewport={"width": 1366, "height": 768},
-            locale="en-US",
-            timezone_id="America/Denver"
-        )
-        page = await context.new_page()
-
-        print("🌐 Navigating to County 10...")
-        try:
-            await page.goto("https://county10.com/events/#/", timeout=60000, wait_until="domcontentloaded")
-        except Exception as e:
-            print(f"⚠️ Navigation timeout (might be slow loading): {e}")
+        # Now wait for actual events
+        await page.wait_for_selector(".csEventTile", state="visible", timeout=20000)
+        print("✅ Events loaded!")
+    except:
+        print("⚠️ Events did not appear (Cloud Blockage?). Saving empty list for today.")
+        # DO NOT FAIL. Return nothing so existing data is kept and other sources still run.
+        return []
 
-        # 3. Soft Wait: Don't crash if it fails, just try to find the container first
-        print("⏳ Waiting for calendar widget...")
-        try:
-            # First look for the main CitySpark container
-            await page.wait_for_selector("#CitySpark", state="attached", timeout=20000)
-            print("   ...Widget container found.")
-            
-            # Now wait for actual events
-            await page.wait_for_selector(".csEventTile", state="visible", timeout=20000)
-            print("✅ Events loaded!")
-        except:
-            print("⚠️ Events did not appear (Cloud Blockage?). Saving empty list for today.")
-            # DO NOT EXIT WITH ERROR. Just save empty/old data and let other scripts run.
-            await browser.close()
-            # We exit normally so the workflow continues
-            sys.exit(0)
-
-        # 4. The Loop
-        print("🏃 Starting Scroll Loop...")
-        previous_count = 0
-        no_change = 0
+    events = None
+    captured_events = []
+    if CAPTURE_MODE:
+        horizon = (scrape_state.now() + timedelta(days=365)).date()
+        captured_events, complete = await capture_events(context, captured, record_to_event, horizon=horizon, label=SOURCE_NAME)
+        if complete:
+            events = captured_events
+        elif captured_events:
+            print("⚠️ CitySpark paging not followed to the end, checking against the scroll loop.")
+        else:
+            print("⚠️ No CitySpark JSON captured, falling back to scrolling.")
+
+    if events is None:
+        events = await scroll_events(page)
+        if len(captured_events) > len(events):
+            print(f"   Keeping the {len(captured_events)} captured events over {len(events)} scrolled.")
+            events = captured_events
+    report_wait_savings(SOURCE_NAME)
+    report_blocking(SOURCE_NAME)
+
+    await page.close()
+    return events
+
+async def scroll_events(page):
+    # The Loop
+    print("🏃 Starting Scroll Loop...")
+    previous_count = 0
+    no_change = 0
+    
+    for i in range(15): # Cap at 15 loops to prevent infinite runs
+        count = await page.locator(".csEventTile").count()
+        await wait_for_update(page, ".csEventTile", count,
+                              action=lambda: page.evaluate("window.scrollTo(0, document.body.scrollHeight)"),
+                              idle=2, timeout=4, label=SOURCE_NAME, replaces=2)
         
-        for i in range(15): # Cap at 15 loops to prevent infinite runs
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(2)
-            
-            # Try clicking "Load More"
-            try:
-                btns = await page.query_selector_all("text=/See\s*More/i")
-                for btn in btns:
-                    if await btn.is_visible():
-                        await btn.click()
-                        await asyncio.sleep(1)
-            except: 
-                pass
-
-            cards = await page.query_selector_all(".csEventTile")
-            count = len(cards)
-            print(f"   Loop {i+1}: {count} events found.")
-            
-            if count == previous_count:
-                no_change += 1
-                if no_change >= 3:
-                    break
-            else:
-                no_change = 0
-                
-            previous_count = count
-
-        # 5. Extract
-        print("👀 Extracting...")
-        cards = await page.query_selector_all(".csEventTile")
-        events = []
+        # Try clicking "Load More"
+        try:
+            btns = await page.query_selector_all("text=/See\s*More/i")
+            for btn in btns:
+                if await btn.is_visible():
+                    # More tiles come from the CitySpark API
+                    count = await page.locator(".csEventTile").count()
+                    await wait_for_update(page, ".csEventTile", count, action=btn.click, response_match="cityspark",
+                                          timeout=2, label=SOURCE_NAME, replaces=1)
+        except: 
+            pass
+
+        count = await page.locator(".csEventTile").count()
+        print(f"   Loop {i+1}: {count} events found.")
         
-        for card in cards:
-            iso_date_raw = await card.get_attribute("data-date")
-            title_el = await card.query_selector(".csOneLine")
-            title = await title_el.inner_text() if title_el else "Unknown"
-            
-            link = ""
-            anchor = await card.query_selector("a") 
-            if anchor: link = await anchor.get_attribute("href")
+        if count == previous_count:
+            no_change += 1
+            if no_change >= 3:
+                break
+        else:
+            no_change = 0
             
-            if link and link.startswith("#"): 
-                link = "https://county10.com/events/" + link
+        previous_count = count
+
+    # Extract
+    print("👀 Extracting...")
+    events = await extract_cards(page)
+    return list({e['link']: e for e in events}.values())
 
-            if iso_date_raw:
-                events.append({
-                    "source": "County 10",
-                    "title": title.strip(),
-                    "date": iso_date_raw.split("T")[0],
-                    "link": link
-                })
+def save_events(events):
+    # Only overwrite file if we actually found data
+    if len(events) > 0:
+        event_store.save_feed(OUTPUT_FILE, events)
+        print(f"🎉 Saved {len(events)} events.")
+    else:
+        print("⚠️ No events found, leaving existing data file untouched.")
 
+async def scrape_county10_stealth():
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        context = await browser.new_context(**CONTEXT_OPTIONS)
+        events = await collect_events(context)
         await browser.close()
-        
-        unique_events = {e['link']: e for e in events}.values()
-        
-        # Only overwrite file if we actually found data
-        if len(unique_events) > 0:
-            with open("county10_data.json", "w") as f:
-                json.dump(list(unique_events), f, indent=2)
-            print(f"🎉 Saved {len(unique_events)} events.")
-        else:
-            print("⚠️ No events found, leaving existing data file untouched.")
+        save_events(events)
 
 if __name__ == "__main__":
     asyncio.run(scrape_county10_stealth())
@@ -1,75 +1,116 @@
 import asyncio
 from playwright.async_api import async_playwright
-import json
+import event_store
 import sys
+from page_waits import wait_for_update, report_wait_savings
+from browser_profile import apply_profile, report_blocking
+import tribe_rest
+import scrape_state
 
-async def scrape_cwc_visual():
-    async with async_playwright() as p:
-        # UPDATED: headless=True for Cloud Execution
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        print("🌐 Navigating to CWC Calendar...")
-        await page.goto("https://www.cwc.edu/calendar/", timeout=60000)
-        
-        try:
-            await page.wait_for_selector(".tribe-events-calendar-list", timeout=15000)
-        except:
-            print("⚠️ Calendar list not found.")
+SOURCE_NAME = "CWC"
+OUTPUT_FILE = "cwc_data.json"
+SITE_URL = "https://www.cwc.edu"
+LAUNCH_ARGS = []
+CONTEXT_OPTIONS = {}
 
-        all_events = []
-        max_clicks = 12 
-        clicks = 0
+# One round trip for every row instead of 4-5 per row
+EXTRACT_JS = """rows => rows.map(row => {
+    const titleEl = row.querySelector('.tribe-events-calendar-list__event-title-link');
+    const timeEl = row.querySelector('time');
+    let date = timeEl ? timeEl.getAttribute('datetime') : '';
+    if (!date && timeEl) date = timeEl.innerText;
+    return {
+        title: titleEl ? titleEl.innerText : null,
+        link: titleEl ? titleEl.getAttribute('href') : null,
+        date: date
+    };
+})"""
 
-        while clicks < max_clicks:
-            print(f"📖 Scraping Month {clicks + 1}...")
-            
-            rows = await page.query_selector_all(".tribe-events-calendar-list__event-row")
-            print(f"   ...Found {len(rows)} events on this page.")
-            
-            for row in rows:
-                title_el = await row.query_selector(".tribe-events-calendar-list__event-title-link")
-                time_el = await row.query_selector("time")
-                
-                if title_el:
-                    title = await title_el.inner_text()
-                    link = await title_el.get_attribute("href")
-                    
-                    date_str = await time_el.get_attribute("datetime") if time_el else ""
-                    if not date_str and time_el:
-                        date_str = await time_el.inner_text()
-                    
-                    all_events.append({
-                        "source": "CWC",
-                        "title": title.strip(),
-                        "date": date_str,
-                        "link": link
-                    })
+async def extract_rows(page):
+    rows = await page.locator(".tribe-events-calendar-list__event-row").evaluate_all(EXTRACT_JS)
+    return [{
+        "source": SOURCE_NAME,
+        "title": row["title"].strip(),
+        "date": row["date"],
+        "link": row["link"]
+    } for row in rows if row["title"] is not None]
 
-            next_btn = await page.query_selector("li.tribe-events-c-top-bar__nav-list-item--next a") or \
-                       await page.query_selector("a.tribe-events-c-top-bar__nav-link--next") or \
-                       await page.query_selector("a[rel='next']")
-            
-            if next_btn:
-                try:
-                    print("   ➡️ Loading next month...")
-                    await next_btn.click()
-                    await asyncio.sleep(4)
-                    clicks += 1
-                except:
-                    print("   ⚠️ Failed to click next.")
-                    break
-            else:
-                print("   🛑 No 'Next' button found (End of calendar).")
-                break
+def fetch_rest_events():
+    state = scrape_state.load_state(SOURCE_NAME)
+    events = tribe_rest.fetch_events(SITE_URL, SOURCE_NAME, state=state)
+    if not events:
+        return None
+    scrape_state.save_state(SOURCE_NAME, state)
+    return list({e['link']: e for e in events}.values())
+
+async def collect_events(context):
+    # REST first; the month-by-month browser walk is the fallback
+    events = await scrape_state.run_fetch(fetch_rest_events)
+    if events:
+        return events
+    print("↩️ Falling back to the browser calendar...")
+    return await collect_browser_events(context)
+
+async def collect_browser_events(context):
+    await apply_profile(context, SOURCE_NAME)
+    page = await context.new_page()
+    
+    print("🌐 Navigating to CWC Calendar...")
+    await page.goto("https://www.cwc.edu/calendar/", timeout=60000)
+    
+    try:
+        await page.wait_for_selector(".tribe-events-calendar-list", timeout=15000)
+    except:
+        print("⚠️ Calendar list not found.")
+
+    all_events = []
+    max_clicks = 12 
+    clicks = 0
 
-        await browser.close()
+    while clicks < max_clicks:
+        print(f"📖 Scraping Month {clicks + 1}...")
         
-        unique_events = {e['link']: e for e in all_events}.values()
+        rows = await extract_rows(page)
+        print(f"   ...Found {len(rows)} events on this page.")
+        all_events.extend(rows)
 
-        with open("cwc_data.json", "w") as f:
-            json.dump(list(unique_events), f, indent=2)
-        print(f"🎉 Saved {len(unique_events)} CWC events.")
+        next_btn = await page.query_selector("li.tribe-events-c-top-bar__nav-list-item--next a") or \
+                   await page.query_selector("a.tribe-events-c-top-bar__nav-link--next") or \
+                   await page.query_selector("a[rel='next']")
+        
+        if next_btn:
+            try:
+                print("   ➡️ Loading next month...")
+                # The Events Calendar v2 swaps the month in via its views REST endpoint
+                await wait_for_update(page, ".tribe-events-calendar-list__event-row", action=next_btn.click,
+                                      response_match="tribe/views/v2", timeout=6, label=SOURCE_NAME, replaces=4)
+                clicks += 1
+            except:
+                print("   ⚠️ Failed to click next.")
+                break
+        else:
+            print("   🛑 No 'Next' button found (End of calendar).")
+            break
+
+    report_wait_savings(SOURCE_NAME)
+    report_blocking(SOURCE_NAME)
+    await page.close()
+    return list({e['link']: e for e in all_events}.values())
+
+def save_events(events):
+    event_store.save_feed(OUTPUT_FILE, events)
+    print(f"🎉 Saved {len(events)} CWC events.")
+
+async def scrape_cwc_visual():
+    events = await scrape_state.run_fetch(fetch_rest_events)
+    if not events:
+        async with async_playwright() as p:
+            # UPDATED: headless=True for Cloud Execution
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            events = await collect_browser_events(context)
+            await browser.close()
+    save_events(events)
 
 if __name__ == "__main__":
     asyncio.run(scrape_cwc_visual())
@@ -1,90 +1,101 @@
 import asyncio
 from playwright.async_api import async_playwright
-import json
-from datetime import datetime, timedelta
+import event_store
+from datetime import timedelta
 import sys
+import thrillshare_api
+import scrape_state
+import http_pool
 
-async def scrape_lvhs_api():
-    async with async_playwright() as p:
-        print("🚀 Starting LVHS Direct Feed Scraper...")
-        
-        # UPDATED: headless=True is required for the cloud environment
-        browser = await p.chromium.launch(headless=True)
-        
-        # We create a context to look like a real user (valid User-Agent)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        
-        base_url = "https://thrillshare-cmsv2.services.thrillshare.com/api/v4/o/24886/cms/events"
-        
-        all_events = []
-        page_num = 1
-        target_date = datetime.now() + timedelta(days=365)
-        keep_scraping = True
+SOURCE_NAME = "LVHS"
+OUTPUT_FILE = "lvhs_data.json"
+LAUNCH_ARGS = []
 
-        while keep_scraping:
-            print(f"📡 Fetching Page {page_num} from School Server...")
-            
-            try:
-                # Use the browser context to fetch the JSON data securely
-                response = await context.request.get(base_url, params={
-                    "slug": "events-lvhs-fremontcsd1wy",
-                    "page_no": str(page_num)
-                })
-                
-                if not response.ok:
-                    print(f"   ⚠️ Server returned error: {response.status}")
-                    break
-                    
-                data = await response.json()
-                
-                events_list = data.get("events", [])
-                if not events_list:
-                    print("   ✅ No more events found. Stopping.")
-                    break
-                
-                print(f"   ...Received {len(events_list)} events.")
-                
-                for event in events_list:
-                    title = event.get("title", "No Title")
-                    start_raw = event.get("start_at", "")
-                    
-                    if start_raw:
-                        final_date = start_raw
-                    else:
-                        continue 
+# We create a context to look like a real user (valid User-Agent)
+CONTEXT_OPTIONS = {
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+API_URL = "https://thrillshare-cmsv2.services.thrillshare.com/api/v4/o/24886/cms/events"
+API_SLUG = "events-lvhs-fremontcsd1wy"
+EVENTS_LINK = "https://www.landerschools.org/o/lvhs/events"
+
+def fetch_http_events():
+    state = scrape_state.load_state(SOURCE_NAME)
+    events = thrillshare_api.fetch_events(API_URL, API_SLUG, SOURCE_NAME, EVENTS_LINK,
+                                          user_agent=CONTEXT_OPTIONS["user_agent"], state=state)
+    if events is not None:
+        scrape_state.save_state(SOURCE_NAME, state)
+    return events
+
+async def collect_events(context):
+    events = await scrape_state.run_fetch(fetch_http_events)
+    if events is not None:
+        return events
+    print("↩️ Falling back to the browser request context...")
+    return await collect_browser_events(context)
 
-                    all_events.append({
-                        "source": "LVHS",
-                        "title": title.strip(),
-                        "date": final_date,
-                        "link": "https://www.landerschools.org/o/lvhs/events"
-                    })
-                    
-                    try:
-                        dt = datetime.fromisoformat(start_raw.replace('Z', '+00:00'))
-                        dt_naive = dt.replace(tzinfo=None)
-                        if dt_naive > target_date:
-                            print("   🕒 Reached 1 year target.")
-                            keep_scraping = False
-                    except:
-                        pass
+async def collect_browser_events(context):
+    base_url = API_URL
+    
+    all_events = []
+    page_num = 1
+    target_date = scrape_state.now() + timedelta(days=365)
+    keep_scraping = True
 
-                page_num += 1
-                await asyncio.sleep(0.5) 
+    while keep_scraping:
+        print(f"📡 Fetching Page {page_num} from School Server...")
+        
+        try:
+            # Use the browser context to fetch the JSON data securely
+            response = await http_pool.api_request(context, base_url, params={
+                "slug": API_SLUG,
+                "page_no": str(page_num)
+            })
+            
+            if not response.ok:
+                print(f"   ⚠️ Server returned error: {response.status}")
+                break
                 
-            except Exception as e:
-                print(f"   ❌ Error fetching data: {e}")
+            data = await response.json()
+            
+            events_list = data.get("events", [])
+            if not events_list:
+                print("   ✅ No more events found. Stopping.")
                 break
+            
+            print(f"   ...Received {len(events_list)} events.")
+            
+            records, reached = thrillshare_api.page_events(events_list, target_date, SOURCE_NAME, EVENTS_LINK)
+            all_events.extend(records)
+            if reached:
+                print("   🕒 Reached 1 year target.")
+                keep_scraping = False
 
-        await browser.close()
-        
-        unique_events = {f"{e['title']}{e['date']}": e for e in all_events}.values()
-        
-        with open("lvhs_data.json", "w") as f:
-            json.dump(list(unique_events), f, indent=2)
-        print(f"🎉 Saved {len(unique_events)} LVHS events.")
+            page_num += 1
+            await asyncio.sleep(0.5) 
+            
+        except Exception as e:
+            print(f"   ❌ Error fetching data: {e}")
+            break
+
+    return list({f"{e['title']}{e['date']}": e for e in all_events}.values())
+
+def save_events(events):
+    event_store.save_feed(OUTPUT_FILE, events)
+    print(f"🎉 Saved {len(events)} LVHS events.")
+
+async def scrape_lvhs_api():
+    print("🚀 Starting LVHS Direct Feed Scraper...")
+    events = await scrape_state.run_fetch(fetch_http_events)
+    if events is None:
+        async with async_playwright() as p:
+            # UPDATED: headless=True is required for the cloud environment
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            events = await collect_browser_events(context)
+            await browser.close()
+    save_events(events)
 
 if __name__ == "__main__":
     asyncio.run(scrape_lvhs_api())
@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from urllib.parse import urlencode
+
+import http_pool
+
+# Per-source scrape checkpoints for the HTTP scrapers. For every page/API
+# response we keep its ETag / Last-Modified, a hash of the body and the
+# (trimmed) data we used from it, plus the horizon date the run reached.
+# The next run sends conditional requests; a 304 reuses yesterday's data for
+# that page, so the output is the same as a full crawl without the download.
+# State is only saved after a successful run.
+
+STATE_DIR = ".scrape_state"
+STATE_VERSION = 1
+# Set by `scrape_all.py --full` to ignore saved state for one run
+FORCE_FULL = False
+# Frozen clock for benchmark_scrapers.py, so replayed runs ask for the same dates
+NOW = None
+# Set by scrape_all.py: blocking fetches run in a child process that a timeout
+# can kill (asyncio.wait_for can't stop a thread, it keeps downloading)
+ISOLATE_FETCHES = False
+
+
+def now():
+    return NOW or datetime.now()
+
+
+def state_file(source_name):
+    return os.path.join(STATE_DIR, re.sub(r'[^a-z0-9]+', '_', source_name.lower()).strip('_') + ".json")
+
+
+def empty_state():
+    return {"version": STATE_VERSION, "horizon": None, "pages": {}}
+
+
+def load_state(source_name):
+    if FORCE_FULL:
+        return empty_state()
+    try:
+        with open(state_file(source_name), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return empty_state()
+    if state.get("version") != STATE_VERSION:
+        return empty_state()
+    return state
+
+
+def save_state(source_name, state):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    path = state_file(source_name)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def start_run(state):
+    # Pages seen this run replace the old map, so dropped pages age out
+    return {"old": state.get("pages", {}), "pages": {}, "lock": threading.Lock(),
+            "fetched": 0, "not_modified": 0, "unchanged": 0}
+
+
+def finish_run(state, run, horizon):
+    state["pages"] = run["pages"]
+    state["horizon"] = horizon
+    return state
+
+
+def page_key(url, params):
+    return url + ("?" + urlencode(sorted(params.items())) if params else "")
+
+
+def fetch_page(pool, run, url, params=None, headers=None, trim=None):
+    """Conditional GET of one JSON page -> the (trimmed) data for it.
+
+    `trim` reduces the payload to what the scraper uses, which is also what
+    gets stored for reuse. Raises HTTPException on a bad status.
+    """
+    key = page_key(url, params)
+    cached = run["old"].get(key)
+    conditional = dict(headers or {})
+    if cached and cached.get("etag"):
+        conditional["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        conditional["If-Modified-Since"] = cached["last_modified"]
+
+    response, body = http_pool.request(pool, url, params, conditional)
+    if response.status == 304 and cached:
+        with run["lock"]:
+            run["not_modified"] += 1
+            run["pages"][key] = cached
+        return cached["data"]
+    http_pool.check_status(response, url)
+
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    data = json.loads(body)
+    if trim:
+        data = trim(data)
+    with run["lock"]:
+        run["fetched"] += 1
+        if cached and cached.get("hash") == digest:
+            run["unchanged"] += 1
+        run["pages"][key] = {
+            "etag": response.getheader("ETag"),
+            "last_modified": response.getheader("Last-Modified"),
+            "hash": digest,
+            "data": data
+        }
+    return data
+
+
+def report_run(source_name, run):
+    print(f"♻️ {source_name}: {run['not_modified']} pages not modified (reused), {run['fetched']} downloaded "
+          f"({run['unchanged']} of those identical to last run).")
+
+
+async def run_fetch(fn):
+    """Run a blocking, module-level fetch function off the event loop.
+
+    In a thread by default; with ISOLATE_FETCHES in a child interpreter that is
+    killed if the awaiting task is cancelled. The result must be JSON.
+    """
+    if not ISOLATE_FETCHES:
+        return await asyncio.to_thread(fn)
+    module_name = fn.__module__
+    if module_name == "__main__":
+        # A script run directly is imported by its file name in the child
+        module_name = os.path.splitext(os.path.basename(sys.modules["__main__"].__file__))[0]
+    fd, result_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    args = [sys.executable, os.path.abspath(__file__), module_name, fn.__name__, result_path]
+    if FORCE_FULL:
+        args.append("--full")
+    if NOW:
+        args += ["--now", NOW.isoformat()]
+    proc = await asyncio.create_subprocess_exec(*args)
+    try:
+        code = await proc.wait()
+        if code != 0:
+            raise RuntimeError(f"{module_name}.{fn.__name__} exited with status {code}")
+        with open(result_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        os.remove(result_path)
+
+
+if __name__ == "__main__":
+    # Child side of run_fetch: <module> <function> <result.json> [--full] [--now ISO]
+    module_name, function_name, result_path = sys.argv[1:4]
+    import scrape_state  # the copy the scrapers import, not this __main__
+    scrape_state.FORCE_FULL = "--full" in sys.argv
+    if "--now" in sys.argv:
+        scrape_state.NOW = datetime.fromisoformat(sys.argv[sys.argv.index("--now") + 1])
+    result = getattr(importlib.import_module(module_name), function_name)()
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
@@ -1,93 +1,137 @@
 import asyncio
 from playwright.async_api import async_playwright
-import json
-from datetime import datetime, timedelta
+import event_store
+from datetime import timedelta
 import sys
+from page_waits import wait_for_update, report_wait_savings
+from browser_profile import apply_profile, report_blocking
+import tribe_rest
+import scrape_state
 from dateutil import parser 
 
-async def scrape_windriver_marathon():
-    async with async_playwright() as p:
-        # UPDATED: headless=True for Cloud Execution
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+SOURCE_NAME = "Wind River"
+OUTPUT_FILE = "windriver_data.json"
+SITE_URL = "https://windriver.org"
+LAUNCH_ARGS = []
+CONTEXT_OPTIONS = {}
+
+# One round trip for every card instead of 4-5 per card
+EXTRACT_JS = """cards => cards.map(card => {
+    const titleEl = card.querySelector('.tribe-events-list-event-title a');
+    const dateEl = card.querySelector('.tribe-event-date-start');
+    return {
+        title: titleEl ? titleEl.innerText : null,
+        link: titleEl ? titleEl.getAttribute('href') : null,
+        date: dateEl ? dateEl.innerText : null
+    };
+})"""
+
+async def extract_cards(page):
+    cards = await page.locator(".type-tribe_events").evaluate_all(EXTRACT_JS)
+    return [{
+        "source": SOURCE_NAME,
+        "title": card["title"].strip(),
+        "date": card["date"].strip(),
+        "link": card["link"]
+    } for card in cards if card["title"] is not None and card["date"] is not None]
+
+def fetch_rest_events():
+    state = scrape_state.load_state(SOURCE_NAME)
+    events = tribe_rest.fetch_events(SITE_URL, SOURCE_NAME, state=state)
+    if not events:
+        return None
+    scrape_state.save_state(SOURCE_NAME, state)
+    return list({f"{e['title']}{e['date']}": e for e in events}.values())
+
+async def collect_events(context):
+    # REST first; clicking through the list pages is the fallback
+    events = await scrape_state.run_fetch(fetch_rest_events)
+    if events:
+        return events
+    print("↩️ Falling back to the browser list view...")
+    return await collect_browser_events(context)
 
-        print("🌐 Navigating to Wind River...")
-        await page.goto("https://windriver.org/events/", timeout=60000)
+async def collect_browser_events(context):
+    await apply_profile(context, SOURCE_NAME)
+    page = await context.new_page()
+
+    print("🌐 Navigating to Wind River...")
+    await page.goto("https://windriver.org/events/", timeout=60000)
+
+    all_events = []
+    today = scrape_state.now()
+    target_date = today + timedelta(days=365)
+    
+    page_num = 1
+    max_pages = 60
+    reached_target = False
+
+    while page_num <= max_pages and not reached_target:
+        print(f"📖 Scraping Page {page_num}...")
+        
+        try:
+            await page.wait_for_selector(".type-tribe_events", timeout=10000)
+        except:
+            print("   ⚠️ No events found on this page. Retrying or stopping.")
+            break
 
-        all_events = []
-        target_date = datetime.now() + timedelta(days=365)
+        cards = await extract_cards(page)
+        print(f"   ...Found {len(cards)} events.")
+        all_events.extend(cards)
         
-        page_num = 1
-        max_pages = 60
-        reached_target = False
+        last_event_date = None
 
-        while page_num <= max_pages and not reached_target:
-            print(f"📖 Scraping Page {page_num}...")
-            
+        for card in cards:
             try:
-                await page.wait_for_selector(".type-tribe_events", timeout=10000)
+                clean_d = card["date"].split('@')[0].strip()
+                dt = parser.parse(clean_d, default=today.replace(hour=0, minute=0, second=0, microsecond=0))
+                if dt.month < today.month and dt.year == today.year:
+                     dt = dt.replace(year=dt.year + 1)
+                last_event_date = dt
             except:
-                print("   ⚠️ No events found on this page. Retrying or stopping.")
+                pass
+        
+        if last_event_date:
+            print(f"   ...Latest event on page: {last_event_date.strftime('%Y-%m-%d')}")
+            if last_event_date > target_date:
+                print("✅ Reached target date (1 year out). Stopping.")
+                reached_target = True
                 break
 
-            cards = await page.query_selector_all(".type-tribe_events")
-            print(f"   ...Found {len(cards)} events.")
-            
-            last_event_date = None
-
-            for card in cards:
-                title_el = await card.query_selector(".tribe-events-list-event-title a")
-                date_el = await card.query_selector(".tribe-event-date-start")
-                
-                if title_el and date_el:
-                    title = await title_el.inner_text()
-                    link = await title_el.get_attribute("href")
-                    date_str = await date_el.inner_text()
-                    
-                    all_events.append({
-                        "source": "Wind River",
-                        "title": title.strip(),
-                        "date": date_str.strip(),
-                        "link": link
-                    })
-                    
-                    try:
-                        clean_d = date_str.split('@')[0].strip()
-                        dt = parser.parse(clean_d)
-                        if dt.month < datetime.now().month and dt.year == datetime.now().year:
-                             dt = dt.replace(year=dt.year + 1)
-                        last_event_date = dt
-                    except:
-                        pass
-            
-            if last_event_date:
-                print(f"   ...Latest event on page: {last_event_date.strftime('%Y-%m-%d')}")
-                if last_event_date > target_date:
-                    print("✅ Reached target date (1 year out). Stopping.")
-                    reached_target = True
-                    break
-
-            try:
-                next_btn = await page.query_selector("li.tribe-events-nav-next a")
-                if next_btn:
-                    await next_btn.scroll_into_view_if_needed()
-                    await next_btn.click()
-                    await page.wait_for_timeout(2000) 
-                    page_num += 1
-                else:
-                    print("   🛑 No 'Next' button found. End of calendar.")
-                    break
-            except Exception as e:
-                print(f"   ⚠️ Error clicking next: {e}")
+        try:
+            next_btn = await page.query_selector("li.tribe-events-nav-next a")
+            if next_btn:
+                await next_btn.scroll_into_view_if_needed()
+                # The legacy Tribe list view pages through admin-ajax.php
+                await wait_for_update(page, ".type-tribe_events", action=next_btn.click,
+                                      response_match="admin-ajax.php", timeout=4, label=SOURCE_NAME, replaces=2)
+                page_num += 1
+            else:
+                print("   🛑 No 'Next' button found. End of calendar.")
                 break
+        except Exception as e:
+            print(f"   ⚠️ Error clicking next: {e}")
+            break
 
-        await browser.close()
-        
-        unique_events = {f"{e['title']}{e['date']}": e for e in all_events}.values()
-        
-        with open("windriver_data.json", "w") as f:
-            json.dump(list(unique_events), f, indent=2)
-        print(f"🎉 Saved {len(unique_events)} Wind River events.")
+    report_wait_savings(SOURCE_NAME)
+    report_blocking(SOURCE_NAME)
+    await page.close()
+    return list({f"{e['title']}{e['date']}": e for e in all_events}.values())
+
+def save_events(events):
+    event_store.save_feed(OUTPUT_FILE, events)
+    print(f"🎉 Saved {len(events)} Wind River events.")
+
+async def scrape_windriver_marathon():
+    events = await scrape_state.run_fetch(fetch_rest_events)
+    if not events:
+        async with async_playwright() as p:
+            # UPDATED: headless=True for Cloud Execution
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            events = await collect_browser_events(context)
+            await browser.close()
+    save_events(events)
 
 if __name__ == "__main__":
     asyncio.run(scrape_windriver_marathon())
@@ -0,0 +1,99 @@
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import http_pool
+import scrape_state
+
+# Browserless paging for Thrillshare CMS event feeds (LVHS).
+# The feed only pages by page_no, so we keep PREFETCH requests in flight
+# ahead of the page being processed and stop at the first empty page or once
+# an event starts past the horizon. Requests go through http_pool, so they
+# reuse keep-alive connections and back off on 429/5xx, and are conditional
+# when a scrape_state dict is passed in.
+
+PREFETCH = 4
+MAX_PAGES = 100
+HORIZON_DAYS = 365
+
+
+def page_events(events_list, target_date, source_name, link):
+    # -> (records, reached_horizon)
+    records = []
+    reached = False
+    for event in events_list:
+        title = event.get("title", "No Title")
+        start_raw = event.get("start_at", "")
+        if not start_raw:
+            continue
+        records.append({
+            "source": source_name,
+            "title": title.strip(),
+            "date": start_raw,
+            "link": link
+        })
+        try:
+            dt = datetime.fromisoformat(start_raw.replace('Z', '+00:00'))
+            if dt.replace(tzinfo=None) > target_date:
+                reached = True
+        except ValueError:
+            pass
+    return records, reached
+
+
+def trim_page(data):
+    return {"events": [{k: e.get(k) for k in ("title", "start_at")} for e in data.get("events", [])]}
+
+
+def fetch_events(api_url, slug, source_name, link, user_agent=None, prefetch=PREFETCH, target_date=None, state=None):
+    """Every event up to the horizon, or None if the first page can't be fetched."""
+    target_date = target_date or scrape_state.now() + timedelta(days=HORIZON_DAYS)
+    pool = http_pool.new_pool()
+    run = scrape_state.start_run(state or scrape_state.empty_state())
+    headers = {"User-Agent": user_agent} if user_agent else None
+
+    def fetch(page_num):
+        params = {"slug": slug, "page_no": str(page_num)}
+        return scrape_state.fetch_page(pool, run, api_url, params, headers=headers, trim=trim_page)
+
+    all_events = []
+    pending = {}
+    next_page = 1
+    page_num = 1
+    try:
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            while page_num <= MAX_PAGES:
+                while len(pending) < prefetch and next_page <= MAX_PAGES:
+                    pending[next_page] = executor.submit(fetch, next_page)
+                    next_page += 1
+                try:
+                    data = pending.pop(page_num).result()
+                except (http.client.HTTPException, OSError, ValueError) as e:
+                    if page_num == 1:
+                        print(f"⚠️ {source_name} API unavailable over plain HTTP ({e}).")
+                        return None
+                    print(f"   ❌ Error fetching page {page_num}: {e}")
+                    break
+
+                events_list = data.get("events", [])
+                if not events_list:
+                    print("   ✅ No more events found. Stopping.")
+                    break
+                print(f"📡 Page {page_num}: {len(events_list)} events.")
+                records, reached = page_events(events_list, target_date, source_name, link)
+                all_events.extend(records)
+                if reached:
+                    print("   🕒 Reached 1 year target.")
+                    break
+                page_num += 1
+            # Pages requested past the stop point are dropped
+            for future in pending.values():
+                future.cancel()
+    finally:
+        http_pool.close_pool(pool)
+    if pool["retries"]:
+        print(f"   ...{pool['retries']} requests were retried after 429/5xx responses.")
+    if state is not None:
+        scrape_state.finish_run(state, run, target_date.strftime("%Y-%m-%d"))
+        scrape_state.report_run(source_name, run)
+    return list({f"{e['title']}{e['date']}": e for e in all_events}.values())
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from dateutil import parser
+
+import build_calendar
+from build_calendar import SOURCES, DATE_PARSERS, ISO_DATE_RE, iter_source_records, parse_generic_date
+
+# Runs every committed record through its source's fast-path date parser and
+# checks it gives the same day as dateutil and as the generic parser.
+
+
+def dateutil_day(date_str, link_str):
+    # Recurring WRVC events carry the occurrence date in the link
+    if not ISO_DATE_RE.search(date_str) and link_str:
+        url_match = ISO_DATE_RE.search(link_str)
+        if url_match: return url_match.group(1)
+    default = datetime(build_calendar.reference_now.year, 1, 1)
+    return parser.parse(date_str, default=default, fuzzy=True).strftime("%Y-%m-%d")
+
+
+def test_dates():
+    build_calendar.set_reference_now()
+    checked = 0
+    for filename, source_name in SOURCES:
+        fast = DATE_PARSERS.get(source_name)
+        if not fast:
+            continue
+        records = list(iter_source_records(filename))
+        misses = 0
+        for r in records:
+            date_str, link = str(r["date"]), r.get("link") or ""
+            day = fast(date_str, link)
+            if day is None:
+                misses += 1
+                continue
+            # Test Case 1: Same day as dateutil
+            assert day == dateutil_day(date_str, link), f"{source_name}: {date_str!r} -> {day}, dateutil disagrees"
+            # Test Case 2: Same day as the generic parser
+            assert day == parse_generic_date(date_str, link), f"{source_name}: {date_str!r} -> {day}, generic parser disagrees"
+            checked += 1
+        print(f"{source_name}: {len(records) - misses}/{len(records)} dates on the fast path")
+        # Test Case 3: The committed feeds never need the slow path
+        assert misses == 0, f"{source_name}: {misses} dates fell off the fast path"
+
+    # Test Case 4: Odd values drop back instead of guessing
+    assert DATE_PARSERS["LVHS"]("TBA", "") is None
+    assert DATE_PARSERS["WRVC"]("Ongoing", "https://windriver.org/event/x/") is None
+    assert DATE_PARSERS["WRVC"]("February 30 @ 8:00 am", "") is None
+
+    print(f"\n✅ {checked} Fast-Path Dates Verified!")
+
+
+if __name__ == "__main__":
+    test_dates()
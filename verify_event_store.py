@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+
+import event_store
+
+# Checks the committed feeds are in canonical export form, then runs
+# save_feed in a scratch directory and checks that ids only follow an
+# event's identity: siblings coming and going, feed order, retitles and
+# reschedules.
+
+FEED = "lvhs_data.json"
+LINK = "https://www.landerschools.org/o/lvhs/events"
+
+
+def lvhs(title, date="2026-03-06T18:00:00.000-07:00", link=LINK):
+    return {"source": "LVHS", "title": title, "date": date, "link": link}
+
+
+def cwc(title, date, slug):
+    return {"source": "CWC", "title": title, "date": date, "link": f"https://www.cwc.edu/event/{slug}/"}
+
+
+def save(events, feed=FEED):
+    event_store.save_feed(feed, events, "events.db")
+    with open(feed, "r", encoding="utf-8") as f:
+        exported = json.load(f)
+    with open(os.path.join(event_store.DELTA_DIR, feed.replace("_data.json", ".json")), "r", encoding="utf-8") as f:
+        delta = json.load(f)
+    return {e["title"]: e["id"] for e in exported}, delta
+
+
+def test_event_store():
+    # Test Case 1: Committed feeds are already in export form, so JSON and --store builds agree
+    for filename in event_store.data_files():
+        with open(filename, "r", encoding="utf-8") as f:
+            content = f.read()
+        records = [{k: v for k, v in e.items() if k != "id"} for e in json.loads(content)]
+        canonical = json.dumps(event_store.with_ids(records), indent=2, sort_keys=True) + "\n"
+        assert content == canonical, f"{filename} is not canonical; run `python event_store.py import` then `export`"
+
+    os.chdir(tempfile.mkdtemp(prefix="event_store_"))
+    boys, girls, band = lvhs("Boys Basketball"), lvhs("Girls Basketball"), lvhs("Band Concert", "2026-03-07T19:00:00.000-07:00")
+
+    # Test Case 2: Sibling removal (same LVHS link and date) keeps the survivor's id
+    ids, delta = save([boys, girls, band])
+    print(f"First run: {ids}")
+    assert len(set(ids.values())) == 3, "Ids must be unique"
+    ids2, delta = save([boys, band])
+    print(f"Girls dropped: {ids2} delta {delta['added']} {delta['removed']}")
+    assert ids2["Boys Basketball"] == ids["Boys Basketball"], "Removing a sibling changed Boys' id"
+    assert delta["added"] == [] and delta["removed"] == [ids["Girls Basketball"]], "Delta should only remove Girls"
+
+    # Test Case 3: Reordering the feed changes nothing
+    ids3, delta = save([band, girls, boys])
+    ids4, delta = save([boys, girls, band])
+    print(f"Reordered: {ids4}")
+    assert ids3 == ids4 == ids, "Feed order changed ids"
+    assert not (delta["added"] or delta["removed"] or delta["changed"]), "Reordering produced a delta"
+
+    # Test Case 4: On a shared-link feed a retitle is one removal plus one addition
+    ids5, delta = save([lvhs("Boys Varsity Basketball"), girls, band])
+    print(f"Retitled: {ids5}")
+    assert ids5["Girls Basketball"] == ids["Girls Basketball"] and ids5["Band Concert"] == ids["Band Concert"]
+    assert [e["id"] for e in delta["added"]] == [ids5["Boys Varsity Basketball"]]
+    assert delta["removed"] == [ids["Boys Basketball"]]
+
+    # Test Case 5: With per-event links, retitles and reschedules keep the id and show as changed
+    feed = "cwc_data.json"
+    ids, delta = save([cwc("Spring Play", "2026-03-05", "spring-play"), cwc("Job Fair", "2026-03-10", "job-fair")], feed)
+    ids2, delta = save([cwc("Spring Play: Opening Night", "2026-03-06", "spring-play"), cwc("Job Fair", "2026-03-10", "job-fair")], feed)
+    print(f"CWC retitled + rescheduled: {ids2} changed {[e['title'] for e in delta['changed']]}")
+    assert ids2["Spring Play: Opening Night"] == ids["Spring Play"], "Retitle changed a per-event link's id"
+    assert not delta["added"] and not delta["removed"], "Retitle reported as remove + add"
+    assert [e["id"] for e in delta["changed"]] == [ids["Spring Play"]]
+
+    # Test Case 6: A link repeated on several dates (recurring) gets one id per date
+    weekly = [cwc("Open Gym", f"2026-03-{d:02d}", "open-gym") for d in (2, 9, 16)]
+    ids3 = [e["id"] for e in event_store.with_ids(weekly)]
+    assert len(set(ids3)) == 3, "Recurring dates share an id"
+    assert ids3[1:] == [e["id"] for e in event_store.with_ids(weekly[1:])], "Dropping an occurrence moved the others' ids"
+
+    # Test Case 7: Exact duplicate records still get distinct ids
+    ids6 = [e["id"] for e in event_store.with_ids([boys, dict(boys)])]
+    print(f"Duplicates: {ids6}")
+    assert len(set(ids6)) == 2
+
+    # Test Case 8: A feed that lists the same record twice keeps both through the store
+    no_school = lvhs("No School", "2026-03-13T00:00:00.000-07:00")
+    event_store.save_feed(FEED, [no_school, dict(no_school), band], "events.db")
+    with open(FEED, "r", encoding="utf-8") as f:
+        exported = json.load(f)
+    repeats = [e["id"] for e in exported if e["title"] == "No School"]
+    print(f"Repeated listing: {repeats}")
+    assert len(exported) == 3 and repeats == [repeats[0], repeats[0] + "-1"], "Exact repeat was dropped by the store"
+
+    print("\n✅ Event Store Ids Verified!")
+
+
+if __name__ == "__main__":
+    test_event_store()
@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import tempfile
+
+import build_calendar
+from build_calendar import SOURCES, build_events
+
+# Copies the committed feeds into a scratch directory, edits them the way a
+# daily scrape would and checks an incremental build (reusing the manifest)
+# always gives exactly what a full rebuild gives.
+
+
+def snapshot(events):
+    return [(e["start"], e["title"], e["url"], e["extendedProps"]["source"], e["extendedProps"]["categories"]) for e in events]
+
+
+def build(manifest=None):
+    build_calendar.reset_metrics()
+    events, new_manifest = build_events(manifest)
+    # Through JSON, the way the manifest comes back from .build_cache
+    return snapshot(events), json.loads(json.dumps(new_manifest))
+
+
+def edit_feed(filename, change):
+    with open(filename, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    change(records)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+
+
+def check(manifest, label):
+    full, _ = build()
+    incremental, manifest = build(manifest)
+    reused = build_calendar.build_metrics["counters"].get("dates_reused", 0)
+    print(f"{label}: {len(incremental)} events, {reused} dates reused")
+    assert incremental == full, f"{label}: incremental build differs from a full build"
+    return manifest, reused
+
+
+def test_incremental():
+    repo = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="incremental_"))
+    for filename, _ in SOURCES:
+        shutil.copyfile(os.path.join(repo, filename), filename)
+    build_calendar.set_reference_now()
+    _, manifest = build()
+
+    # Test Case 1: Nothing changed -> every source and date reused
+    manifest, reused = check(manifest, "Unchanged")
+    assert build_calendar.build_metrics["counters"].get("sources_reused") == len(SOURCES), "Unchanged sources were re-read"
+    assert reused == len(manifest["dates"]), "Unchanged dates were deduplicated again"
+
+    # Test Case 2: One source retitles, drops and adds events
+    def wrvc_changes(records):
+        records[0]["title"] += " (Rescheduled)"
+        del records[1]
+        with open("county10_data.json", "r", encoding="utf-8") as f:
+            records.append(dict(json.load(f)[0], source="Wind River"))  # cross-source duplicate
+    edit_feed("windriver_data.json", wrvc_changes)
+    manifest, _ = check(manifest, "WRVC edited")
+
+    # Test Case 3: An event moves to another day and a source empties out
+    def move(records):
+        records[0]["date"] = "2026-12-24"
+    edit_feed("county10_data.json", move)
+    edit_feed("cwc_data.json", lambda records: records.clear())
+    manifest, _ = check(manifest, "Moved + emptied")
+
+    # Test Case 4: A source file disappears, then comes back
+    os.remove("lvhs_data.json")
+    manifest, _ = check(manifest, "LVHS removed")
+    shutil.copyfile(os.path.join(repo, "lvhs_data.json"), "lvhs_data.json")
+    check(manifest, "LVHS restored")
+
+    os.chdir(repo)
+    print("\n✅ Incremental Builds Verified!")
+
+
+if __name__ == "__main__":
+    test_incremental()
@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+
+import build_calendar
+from build_calendar import detect_series, encode_series, build_dictionaries, SOURCE_COLORS
+
+# Expands every encoded series the way FullCalendar does (daysOfWeek /
+# rrule minus exdates) and checks it gives back exactly the events it replaced.
+
+COLORS = {src: style['bg'] for src, style in SOURCE_COLORS.items()}
+
+
+def make_event(title, day, source="WRVC", url=None):
+    return {
+        "title": title,
+        "start": day.isoformat() if isinstance(day, date) else day,
+        "allDay": True,
+        "url": url or f"https://windriver.org/event/{title.lower().replace(' ', '-')}/{day}/",
+        "color": SOURCE_COLORS[source]['bg'],
+        "textColor": SOURCE_COLORS[source]['text'],
+        "extendedProps": {"source": source, "categories": ["Community & Social"]}
+    }
+
+
+def weekly(title, first, weeks, skip=(), **kw):
+    return [make_event(title, first + timedelta(weeks=w), **kw) for w in range(weeks) if w not in skip]
+
+
+def encode(events):
+    singles, series = detect_series(events)
+    source_table, categories = build_dictionaries(events, COLORS)
+    rows = encode_series(series, {row[0]: i for i, row in enumerate(source_table)},
+                         {cat: 1 << i for i, cat in enumerate(categories)})
+    return singles, rows
+
+
+def expand(row):
+    # -> {date: url}
+    start, until = date.fromisoformat(row["start"]), date.fromisoformat(row["until"])
+    out = dict()
+    d = start
+    while d <= until:
+        if row["freq"] == "weekly":
+            hit = (d.weekday() + 1) % 7 in row["days"]
+        elif "setpos" in row:
+            hit = build_calendar.month_day(d.year, d.month, ("setpos", (row["days"][0] - 1) % 7, row["setpos"])) == d
+        else:
+            hit = d.day == row["monthday"]
+        day = d.isoformat()
+        if hit and day not in row.get("exdates", ()):
+            out[day] = row.get("per", {}).get(day, {}).get("url") or row["url"].replace("{date}", day)
+        d += timedelta(days=1)
+    return out
+
+
+def covered(rows):
+    return {(row["title"], day, url) for row in rows for day, url in expand(row).items()}
+
+
+def test_series():
+    # Test Case 1: Weekly with a skipped week -> one rule plus an exdate
+    events = weekly("Sunday Indoor Tennis", date(2026, 2, 15), 10, skip={4})
+    singles, rows = encode(events)
+    print(f"Weekly: {len(rows)} series, exdates {rows[0].get('exdates')}")
+    assert not singles and len(rows) == 1, "Weekly repeat not detected"
+    assert rows[0]["days"] == [0] and rows[0]["exdates"] == ["2026-03-15"], "Wrong weekday or exdate"
+    assert "per" not in rows[0] and "{date}" in rows[0]["url"], "Date-in-link URLs should be a template"
+    assert covered(rows) == {(e["title"], e["start"], e["url"]) for e in events}, "Expansion differs from the events"
+
+    # Test Case 2: Monthly patterns (3rd Thursday, and the 3rd of each month)
+    thursdays = [build_calendar.month_day(2026, m, ("setpos", 3, 3)) for m in range(2, 9)]
+    events = [make_event("Creative Writing Group", d) for d in thursdays]
+    events += [make_event("Book Nook", date(2026, m, 3), source="Lander Chamber",
+                          url=f"https://info.landerchamber.org/events/details/book-nook-{m:02d}-03-2026-{m}") for m in range(1, 8)]
+    singles, rows = encode(events)
+    by_title = {row["title"]: row for row in rows}
+    print(f"Monthly: {[(r['title'], r.get('setpos'), r.get('monthday')) for r in rows]}")
+    assert by_title["Creative Writing Group"]["setpos"] == 3 and by_title["Creative Writing Group"]["days"] == [4]
+    assert by_title["Book Nook"]["monthday"] == 3, "Day-of-month pattern missed"
+    assert len(by_title["Book Nook"]["per"]) == 6, "Links without the ISO date need per-date overrides"
+    assert covered(rows) == {(e["title"], e["start"], e["url"]) for e in events}, "Expansion differs from the events"
+
+    # Test Case 3: Off-pattern dates, short runs and long breaks
+    events = weekly("Jam Time", date(2026, 2, 21), 6) + [make_event("Jam Time", date(2026, 3, 4))]
+    events += weekly("Jam Time", date(2026, 9, 5), 5)              # back after the summer
+    events += weekly("Chess Club", date(2026, 2, 20), 3)           # too few to bother
+    singles, rows = encode(events)
+    print(f"Exceptions: {len(rows)} series, singles {[(e['title'], e['start']) for e in singles]}")
+    assert len(rows) == 2, "A long break should start a second series"
+    assert sorted((e["title"], e["start"]) for e in singles) == [("Chess Club", "2026-02-20"), ("Chess Club", "2026-02-27"),
+                                                                   ("Chess Club", "2026-03-06"), ("Jam Time", "2026-03-04")]
+
+    # Test Case 4: Real feeds -> series plus singles reproduce the deduplicated events
+    build_calendar.set_reference_now()
+    events, _ = build_calendar.build_events(None)
+    singles, rows = encode(events)
+    rebuilt = covered(rows) | {(e["title"], e["start"], e["url"]) for e in singles}
+    print(f"Feeds: {len(events)} events -> {len(singles)} singles + {len(rows)} series")
+    assert rebuilt == {(e["title"], e["start"], e["url"]) for e in events}, "Series lost or invented occurrences"
+    assert len(singles) + sum(len(expand(r)) for r in rows) == len(events)
+
+    print("\n✅ All Series Detection Verified!")
+
+
+if __name__ == "__main__":
+    test_series()
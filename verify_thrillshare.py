@@ -0,0 +1,87 @@
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import thrillshare_api
+
+# Local mock of /api/v4/o/24886/cms/events: 40 pages of 10 events, one every
+# two days. Page 3 answers 429 and page 5 answers 503 the first time.
+
+API_PATH = "/api/v4/o/24886/cms/events"
+START = datetime(2026, 3, 1)
+PAGE_SIZE = 10
+PAGES = 40
+FAILS = {3: 429, 5: 503}
+SEEN = {"pages": [], "connections": set()}
+
+
+def fake_page(page_no):
+    if page_no > PAGES:
+        return []
+    first = (page_no - 1) * PAGE_SIZE
+    return [{"title": f" Game {i} ", "start_at": (START + timedelta(days=2 * i)).strftime("%Y-%m-%dT18:00:00.000-07:00")}
+            for i in range(first, first + PAGE_SIZE)]
+
+
+class FakeThrillshare(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        SEEN["connections"].add(self.client_address)
+        parts = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if parts.path != API_PATH or params.get("slug") != "events-lvhs-fremontcsd1wy":
+            return self.reply(404, b"{}")
+        page_no = int(params["page_no"])
+        SEEN["pages"].append(page_no)
+        if page_no in FAILS:
+            return self.reply(FAILS.pop(page_no), b"busy", retry_after="0")
+        self.reply(200, json.dumps({"events": fake_page(page_no)}).encode())
+
+    def reply(self, status, body, retry_after=None):
+        self.send_response(status)
+        if retry_after is not None:
+            self.send_header("Retry-After", retry_after)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_thrillshare():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeThrillshare)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{server.server_port}{API_PATH}"
+
+    # Test Case 1: stops at the horizon (event 100 = day 200), retrying 429/503
+    horizon = START + timedelta(days=199)
+    events = thrillshare_api.fetch_events(api_url, "events-lvhs-fremontcsd1wy", "LVHS", "https://example.org/events",
+                                          prefetch=4, target_date=horizon)
+    last_page = 11
+    print(f"Got {len(events)} events; pages requested: {sorted(SEEN['pages'])}; connections: {len(SEEN['connections'])}")
+    assert len(events) == last_page * PAGE_SIZE, "Should keep every event up to and including the horizon page"
+    assert events[0] == {"source": "LVHS", "title": "Game 0", "date": "2026-03-01T18:00:00.000-07:00",
+                         "link": "https://example.org/events"}, "Record shape changed"
+    assert SEEN["pages"].count(3) == 2 and SEEN["pages"].count(5) == 2, "429/503 pages were not retried"
+    assert max(SEEN["pages"]) <= last_page + 4, "Fetched too far past the horizon"
+    assert len(SEEN["connections"]) <= 4, "Connections were not reused"
+
+    # Test Case 2: an empty page ends the feed
+    SEEN["pages"].clear()
+    events = thrillshare_api.fetch_events(api_url, "events-lvhs-fremontcsd1wy", "LVHS", "https://example.org/events",
+                                          target_date=START + timedelta(days=3650))
+    assert len(events) == PAGES * PAGE_SIZE, "Should read every page until the empty one"
+
+    # Test Case 3: unknown feed -> None, so the scraper falls back to the browser
+    assert thrillshare_api.fetch_events(api_url, "wrong-slug", "LVHS", "") is None, "404 should mean fallback"
+
+    server.shutdown()
+    print("\n✅ Thrillshare HTTP paging Verified!")
+
+
+if __name__ == "__main__":
+    test_thrillshare()
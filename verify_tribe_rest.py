@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import scrape_state
+import tribe_rest
+
+# Stand-in for a Tribe REST endpoint: 120 events spread over the year,
+# paged like /wp-json/tribe/events/v1/events, served over HTTP/1.1 keep-alive,
+# with ETags so conditional requests can be answered with 304.
+
+START = datetime(2026, 3, 1)
+FAKE_EVENTS = [{
+    "id": i,
+    "title": f"Event &#8211; number {i} &amp; friends",
+    "url": f"https://example.org/event/number-{i}/",
+    "start_date": (START + timedelta(days=3 * i, hours=18)).strftime("%Y-%m-%d %H:%M:%S")
+} for i in range(120)]
+
+SEEN = {"requests": 0, "not_modified": 0, "connections": set(), "params": []}
+
+
+class FakeTribe(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        SEEN["requests"] += 1
+        SEEN["connections"].add(self.client_address)
+        parts = urlsplit(self.path)
+        if parts.path != tribe_rest.API_PATH:
+            return self.reply(404, b"<html>Not found</html>")
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        SEEN["params"].append(params)
+        start, end = params["start_date"], params["end_date"]
+        matching = [e for e in FAKE_EVENTS if start <= e["start_date"] <= end]
+        per_page, page = int(params["per_page"]), int(params["page"])
+        total_pages = max(1, -(-len(matching) // per_page))
+        body = json.dumps({"events": matching[(page - 1) * per_page:page * per_page], "total": len(matching),
+                           "total_pages": total_pages}).encode()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            SEEN["not_modified"] += 1
+            return self.reply(304, b"", etag)
+        self.reply(200, body, etag)
+
+    def reply(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def child_fetch():
+    # Run by scrape_state.run_fetch in a child process
+    return tribe_rest.fetch_events(os.environ["FAKE_TRIBE_SITE"], "CWC", start=START, days=30)
+
+
+def stalled_fetch():
+    time.sleep(2)
+    with open(os.environ["STALLED_MARKER"], "w") as f:
+        f.write("still running")
+
+
+def test_tribe_rest():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTribe)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    site = f"http://127.0.0.1:{server.server_port}"
+
+    # Test Case 1: every event in range, across month windows and pages, in order
+    state = tribe_rest.scrape_state.empty_state()
+    records = tribe_rest.fetch_events(site, "CWC", start=START, days=200, per_page=10, workers=3, state=state)
+    expected = [e for e in FAKE_EVENTS if e["start_date"] <= (START + timedelta(days=200)).strftime("%Y-%m-%d 23:59:59")]
+    print(f"Fetched {len(records)} records over {SEEN['requests']} requests / {len(SEEN['connections'])} connections")
+    assert [r["link"] for r in records] == [e["url"] for e in expected], "Missing or out-of-order events"
+    assert len(SEEN["connections"]) <= 4, "Connections were not reused"
+
+    # Test Case 2: records look like the scraper output, with real start times
+    first = records[0]
+    print(f"First record: {first}")
+    assert first == {"source": "CWC", "title": "Event – number 0 & friends", "date": "2026-03-01T18:00:00",
+                     "link": "https://example.org/event/number-0/"}, "Record shape changed"
+    assert all(p["start_date"].endswith("-01 00:00:00") for p in SEEN["params"]), "Month ranges not sent"
+
+    # Test Case 3: a second run sends conditional requests and reuses every page
+    first_run_requests = SEEN["requests"]
+    again = tribe_rest.fetch_events(site, "CWC", start=START, days=200, per_page=10, workers=3, state=state)
+    assert again == records, "Checkpointed run must match the full crawl"
+    assert SEEN["not_modified"] == first_run_requests, "Unchanged pages should come back 304"
+
+    # Test Case 4: one changed month is downloaded again, the rest are reused
+    FAKE_EVENTS[0]["title"] = "Renamed"
+    SEEN["not_modified"] = 0
+    changed = tribe_rest.fetch_events(site, "CWC", start=START, days=200, per_page=10, workers=3, state=state)
+    assert changed[0]["title"] == "Renamed" and changed[1:] == records[1:], "Changed page was not refreshed"
+    assert SEEN["not_modified"] == first_run_requests - 1, "Only the changed page should be downloaded"
+
+    # Test Case 5: no REST API -> None, so the scraper falls back to the browser
+    assert tribe_rest.fetch_events(site + "/missing", "WRVC", start=START) is None, "404 should mean fallback"
+
+    # Test Case 6: isolated fetches return the child's records, and a timeout kills the child
+    scrape_state.ISOLATE_FETCHES = True
+    os.environ["FAKE_TRIBE_SITE"] = site
+    isolated = asyncio.run(scrape_state.run_fetch(child_fetch))
+    assert isolated == tribe_rest.fetch_events(site, "CWC", start=START, days=30), "Child fetch returned different records"
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["STALLED_MARKER"] = os.path.join(tmp, "marker")
+        try:
+            asyncio.run(asyncio.wait_for(scrape_state.run_fetch(stalled_fetch), 0.5))
+            assert False, "Stalled fetch should time out"
+        except asyncio.TimeoutError:
+            pass
+        time.sleep(3)
+        assert not os.path.exists(os.environ["STALLED_MARKER"]), "Timed-out fetch kept running"
+    scrape_state.ISOLATE_FETCHES = False
+
+    server.shutdown()
+    print("\n✅ Tribe REST fetcher Verified!")
+
+
+if __name__ == "__main__":
+    test_tribe_rest()